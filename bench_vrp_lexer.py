@@ -0,0 +1,213 @@
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+
+from config_to_excel import (
+    REGEX_SYSNAME,
+    REGEX_INTERFACE_START,
+    REGEX_DESCRIPTION,
+    REGEX_LINK_TYPE,
+    REGEX_DEFAULT_VLAN,
+    REGEX_TRUNK_ALLOW_VLAN,
+    REGEX_SHUTDOWN,
+    REGEX_ETH_TRUNK_MEMBER,
+    REGEX_IP_ADDRESS,
+    parse_vrp_config,
+)
+
+# ==============================================================================
+# Benchmark: keyword-dispatch lexer vs. the original regex cascade, plus the
+# retained memory of dict-per-interface output vs. slotted InterfaceRecords
+#
+#   python bench_vrp_lexer.py                 -> synthetic chassis config
+#   python bench_vrp_lexer.py vrpcfg.cfg      -> real config file(s)
+# ==============================================================================
+
+SYNTHETIC_INTERFACES = 40000   # ~2,000 ports per chassis x 20 chassis worth of lines
+REPEAT = 3
+
+
+def parse_vrp_config_regex(file_path):
+    """Original per-line regex cascade, kept here as the reference implementation."""
+    meta = {"hostname": "", "meth_ip": "", "vlanif2_ip": ""}
+    interfaces = {}
+    current_iface = None
+
+    with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+
+            m_sys = REGEX_SYSNAME.search(line)
+            if m_sys:
+                meta["hostname"] = m_sys.group(1)
+                continue
+
+            match_start = REGEX_INTERFACE_START.search(line)
+            if match_start:
+                if current_iface:
+                    interfaces[current_iface["name"]] = current_iface
+                current_iface = {
+                    "name": match_start.group(1),
+                    "description": "",
+                    "type": "Access",
+                    "vlan": "",
+                    "is_shutdown": False,
+                    "is_trunk_member": False,
+                    "trunk_id": None,
+                }
+                continue
+
+            if current_iface:
+                if line == "#":
+                    interfaces[current_iface["name"]] = current_iface
+                    current_iface = None
+                    continue
+
+                m_ip = REGEX_IP_ADDRESS.search(line)
+                if m_ip:
+                    if current_iface["name"] == "MEth0/0/0":
+                        meta["meth_ip"] = m_ip.group(1)
+                    elif current_iface["name"] == "Vlanif2":
+                        meta["vlanif2_ip"] = m_ip.group(1)
+
+                match_desc = REGEX_DESCRIPTION.search(line)
+                if match_desc:
+                    current_iface["description"] = match_desc.group(1).strip()
+                    continue
+
+                match_type = REGEX_LINK_TYPE.search(line)
+                if match_type:
+                    current_iface["type"] = match_type.group(1).capitalize()
+                    continue
+
+                match_pvid = REGEX_DEFAULT_VLAN.search(line)
+                if match_pvid:
+                    vlan_id = match_pvid.group(1)
+                    current_iface["vlan"] = f"Vlan {vlan_id}" if vlan_id != "1" else ""
+                    continue
+
+                match_trunk = REGEX_TRUNK_ALLOW_VLAN.search(line)
+                if match_trunk:
+                    current_iface["vlan"] = match_trunk.group(1).strip()
+                    continue
+
+                match_member = REGEX_ETH_TRUNK_MEMBER.search(line)
+                if match_member:
+                    trunk_id = match_member.group(1)
+                    current_iface["is_trunk_member"] = True
+                    current_iface["trunk_id"] = trunk_id
+                    current_iface["type"] = f"Eth-Trunk {trunk_id} Member"
+                    current_iface["vlan"] = "See Trunk"
+                    continue
+
+                if REGEX_SHUTDOWN.search(line):
+                    current_iface["is_shutdown"] = True
+
+    if current_iface:
+        interfaces[current_iface["name"]] = current_iface
+
+    return meta, interfaces
+
+
+def write_synthetic_config(path, n_interfaces, seed=7):
+    """Write a VRP current-configuration with realistic per-interface noise."""
+    rnd = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("!Software Version V200R019C10SPC800\n#\nsysname BENCH-CORE-01\n#\n")
+        f.write("interface MEth0/0/0\n ip address 10.0.0.1 255.255.255.0\n#\n")
+        f.write("interface Vlanif2\n ip address 10.2.0.1 255.255.255.0\n#\n")
+        for i in range(n_interfaces):
+            chassis, rem = divmod(i, 48 * 48)
+            slot, port = divmod(rem, 48)
+            f.write(f"interface 10GE{chassis + 1}/{slot}/{port}\n")
+            if rnd.random() < 0.8:
+                f.write(f" description To_SRV{i:05d}_NIC{rnd.randint(1, 4)}\n")
+            kind = rnd.random()
+            if kind < 0.1:
+                f.write(f" eth-trunk {rnd.randint(1, 120)}\n")
+            elif kind < 0.4:
+                f.write(" port link-type trunk\n")
+                f.write(f" port trunk allow-pass vlan 10 to 200 {rnd.randint(300, 400)} 400 to 4094\n")
+            else:
+                f.write(f" port default vlan {rnd.choice(['1', '10', '312', '2001'])}\n")
+            f.write(" stp edged-port enable\n")
+            f.write(" storm suppression unknown-unicast 85\n")
+            f.write(" storm suppression multicast 85\n")
+            f.write(" storm suppression broadcast 85\n")
+            f.write(" undo enable snmp trap updown\n")
+            if rnd.random() < 0.15:
+                f.write(" shutdown\n")
+            f.write(" device transceiver 10GBASE-FIBER\n")
+            f.write("#\n")
+        f.write("return\n")
+
+
+def time_parser(func, path):
+    best = float("inf")
+    result = None
+    for _ in range(REPEAT):
+        with redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            result = func(path)
+            best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def retained_bytes(build):
+    """Bytes still allocated after build() returns (its result kept alive)."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    with redirect_stdout(io.StringIO()):
+        result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+
+def bench_memory(path):
+    mb = 1024 * 1024
+    dicts = retained_bytes(lambda: parse_vrp_config_regex(path))
+    records = retained_bytes(lambda: parse_vrp_config(path))
+    print(f"  retained memory, dict per interface : {dicts / mb:8.2f} MB")
+    print(f"  retained memory, InterfaceRecord    : {records / mb:8.2f} MB  ({dicts / records:.2f}x smaller)")
+
+
+def bench_file(path):
+    size_mb = os.path.getsize(path) / (1024 * 1024)
+    t_regex, out_regex = time_parser(parse_vrp_config_regex, path)
+    t_lexer, out_lexer = time_parser(parse_vrp_config, path)
+
+    status = "OK" if out_regex == out_lexer else "MISMATCH"
+    print(f"{os.path.basename(path)}: {size_mb:.1f} MB, {len(out_lexer[1])} interfaces")
+    print(f"  regex cascade : {t_regex * 1000:8.1f} ms")
+    print(f"  dispatch lexer: {t_lexer * 1000:8.1f} ms  ({t_regex / t_lexer:.2f}x)  output {status}")
+    bench_memory(path)
+    return status == "OK"
+
+
+def main():
+    paths = sys.argv[1:]
+    ok = True
+
+    if paths:
+        for path in paths:
+            ok &= bench_file(path)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "synthetic_vrpcfg.cfg")
+            write_synthetic_config(path, SYNTHETIC_INTERFACES)
+            ok = bench_file(path)
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
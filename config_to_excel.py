@@ -1,12 +1,26 @@
 import re
 import sys
 import os
+import io
+import glob
+import csv
+import json
+import hashlib
+import argparse
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from openpyxl import load_workbook
 from openpyxl.styles import Font
 
+from xlsx_stream import StreamingWorkbook
+from interface_names import canonical_name
+
 # ==============================================================================
 # SECTION 1: REGEX PATTERN COMPILATION
 # ==============================================================================
+# Reference grammar for the VRP lines we care about. The lexer below implements
+# the same rules with one keyword lookup per line; bench_vrp_lexer.py runs this
+# regex cascade against it to check equivalence and measure the speedup.
 
 REGEX_SYSNAME = re.compile(r"^\s*sysname\s+(\S+)")
 REGEX_INTERFACE_START = re.compile(r"^\s*interface\s+([\w\/\.\-]+)")
@@ -18,20 +32,185 @@ REGEX_SHUTDOWN = re.compile(r"^\s*shutdown")
 REGEX_ETH_TRUNK_MEMBER = re.compile(r"^\s*eth-trunk\s+(\d+)")
 REGEX_IP_ADDRESS = re.compile(r"^\s*ip address\s+([\d\.]+)")
 
+# Argument patterns, only applied after the keyword table has classified a line.
+# Each one starts where the keyword ends, so the separator is part of the match.
+ARG_INTERFACE_NAME = re.compile(r"\s+([\w\/\.\-]+)")
+ARG_DIGITS = re.compile(r"\s+(\d+)")
+ARG_IP_ADDRESS = re.compile(r" address\s+([\d\.]+)")
+ARG_LINK_TYPE = re.compile(r" link-type\s+(access|trunk|hybrid)")
+ARG_DEFAULT_VLAN = re.compile(r" default vlan\s+(\d+)")
+ARG_TRUNK_ALLOW_VLAN = re.compile(r" trunk allow-pass vlan\s+(.+)")
+
 # ==============================================================================
-# SECTION 2: PARSING ENGINE
+# SECTION 2: LEXER (KEYWORD DISPATCH TABLE)
 # ==============================================================================
 
-def parse_vrp_config(file_path):
+TOK_SYSNAME = "sysname"
+TOK_INTERFACE = "interface"
+TOK_BLOCK_END = "block_end"
+TOK_IP_ADDRESS = "ip_address"
+TOK_DESCRIPTION = "description"
+TOK_LINK_TYPE = "link_type"
+TOK_DEFAULT_VLAN = "default_vlan"
+TOK_TRUNK_ALLOW_VLAN = "trunk_allow_vlan"
+TOK_ETH_TRUNK_MEMBER = "eth_trunk_member"
+TOK_SHUTDOWN = "shutdown"
+
+
+def _lex_sysname(rest):
+    parts = rest.split(None, 1)
+    return (TOK_SYSNAME, parts[0]) if parts else None
+
+
+def _lex_interface(rest):
+    m = ARG_INTERFACE_NAME.match(rest)
+    return (TOK_INTERFACE, m.group(1)) if m else None
+
+
+def _lex_block_end(rest):
+    return (TOK_BLOCK_END, None) if not rest else None
+
+
+def _lex_ip(rest):
+    m = ARG_IP_ADDRESS.match(rest)
+    return (TOK_IP_ADDRESS, m.group(1)) if m else None
+
+
+def _lex_description(rest):
+    value = rest.strip()
+    return (TOK_DESCRIPTION, value) if value else None
+
+
+def _lex_port(rest):
+    # "port" has three sub-commands we track; the second word picks one
+    sub = rest[1:2]
+    if sub == "l":
+        m = ARG_LINK_TYPE.match(rest)
+        return (TOK_LINK_TYPE, m.group(1).capitalize()) if m else None
+    if sub == "d":
+        m = ARG_DEFAULT_VLAN.match(rest)
+        return (TOK_DEFAULT_VLAN, m.group(1)) if m else None
+    if sub == "t":
+        m = ARG_TRUNK_ALLOW_VLAN.match(rest)
+        return (TOK_TRUNK_ALLOW_VLAN, m.group(1).strip()) if m else None
+    return None
+
+
+def _lex_eth_trunk(rest):
+    m = ARG_DIGITS.match(rest)
+    return (TOK_ETH_TRUNK_MEMBER, m.group(1)) if m else None
+
+
+def _lex_shutdown(rest):
+    return (TOK_SHUTDOWN, None)
+
+
+# First keyword of a stripped line -> argument lexer. Lines whose keyword is not
+# in the table (ospf, stp, undo, ...) are dropped after this single lookup.
+KEYWORD_DISPATCH = {
+    "sysname": _lex_sysname,
+    "interface": _lex_interface,
+    "#": _lex_block_end,
+    "ip": _lex_ip,
+    "description": _lex_description,
+    "port": _lex_port,
+    "eth-trunk": _lex_eth_trunk,
+    "shutdown": _lex_shutdown,
+}
+
+
+def tokenize_vrp(lines):
     """
-    Parses a Huawei VRP configuration file and returns:
-    - meta: hostname, meth_ip, vlanif2_ip
-    - interfaces: dict where keys are Interface Names and values are data dicts
+    Single-pass lexer over VRP configuration lines.
+    Yields (line_num, token, value) for every line the parser acts on.
     """
-    if not os.path.exists(file_path):
-        print(f"[Error] Configuration file not found: {file_path}")
-        sys.exit(1)
+    dispatch = KEYWORD_DISPATCH
+    for line_num, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+
+        keyword = line.split(None, 1)[0]
+        lex = dispatch.get(keyword)
+        if lex is None:
+            # REGEX_SHUTDOWN is a bare prefix match ("shutdown" + anything)
+            if keyword.startswith("shutdown"):
+                yield line_num, TOK_SHUTDOWN, None
+            continue
+
+        token = lex(line[len(keyword):])
+        if token is not None:
+            yield line_num, token[0], token[1]
+
+# ==============================================================================
+# SECTION 3: INTERFACE RECORDS
+# ==============================================================================
+
+class InterfaceRecord:
+    """
+    One parsed interface. Slotted instead of a per-interface dict; repeated
+    values (port type, VLAN strings, trunk ids) are interned by the parser.
+    Supports iface["field"] / iface.get() so report code can treat it like
+    the old dicts.
+    """
+    __slots__ = ("name", "description", "type", "vlan", "is_shutdown", "is_trunk_member", "trunk_id")
+
+    def __init__(self, name, description="", type="Access", vlan="", is_shutdown=False,
+                 is_trunk_member=False, trunk_id=None):
+        self.name = name
+        self.description = description
+        self.type = type
+        self.vlan = vlan                  # IMPORTANT: default empty (do NOT output vlan 1)
+        self.is_shutdown = is_shutdown
+        self.is_trunk_member = is_trunk_member
+        self.trunk_id = trunk_id
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except (AttributeError, TypeError):
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        setattr(self, key, value)
 
+    def get(self, key, default=None):
+        return getattr(self, key, default) if key in self.__slots__ else default
+
+    def keys(self):
+        return self.__slots__
+
+    def as_tuple(self):
+        return tuple(getattr(self, f) for f in self.__slots__)
+
+    def as_dict(self):
+        return {f: getattr(self, f) for f in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{f: data[f] for f in cls.__slots__ if f in data})
+
+    def __eq__(self, other):
+        if isinstance(other, InterfaceRecord):
+            return self.as_tuple() == other.as_tuple()
+        if isinstance(other, dict):
+            return self.as_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"InterfaceRecord({self.as_dict()!r})"
+
+# ==============================================================================
+# SECTION 4: PARSING ENGINE
+# ==============================================================================
+
+def parse_vrp_lines(lines):
+    """
+    Parse an iterable of VRP configuration lines (file object, list, or a
+    single interface block) and return (meta, {name: InterfaceRecord}).
+    """
     meta = {
         "hostname": "",
         "meth_ip": "",
@@ -40,112 +219,211 @@ def parse_vrp_config(file_path):
 
     interfaces = {}
     current_iface = None
+    intern = sys.intern
 
-    print(f"[*] Starting lexical analysis of {file_path}...")
+    for line_num, token, value in tokenize_vrp(lines):
+        # Global hostname
+        if token == TOK_SYSNAME:
+            meta["hostname"] = value
+            continue
 
-    with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-        for line_num, line in enumerate(f, 1):
-            line = line.strip()
-            if not line:
-                continue
+        # Interface block start
+        if token == TOK_INTERFACE:
+            if current_iface:
+                interfaces[current_iface.name] = current_iface
 
-            # Global hostname
-            m_sys = REGEX_SYSNAME.search(line)
-            if m_sys:
-                meta["hostname"] = m_sys.group(1)
-                continue
+            current_iface = InterfaceRecord(value)
+            continue
 
-            # Interface block start
-            match_start = REGEX_INTERFACE_START.search(line)
-            if match_start:
-                if current_iface:
-                    interfaces[current_iface["name"]] = current_iface
-
-                name = match_start.group(1)
-                current_iface = {
-                    "name": name,
-                    "description": "",
-                    "type": "Access",
-                    "vlan": "",          # IMPORTANT: default empty (do NOT output vlan 1)
-                    "is_shutdown": False,
-                    "is_trunk_member": False,
-                    "trunk_id": None,
-                }
-                continue
+        # Everything else only applies inside an interface block
+        if not current_iface:
+            continue
 
-            # Inside interface block
-            if current_iface:
-                # block end
-                if line == "#":
-                    interfaces[current_iface["name"]] = current_iface
-                    current_iface = None
-                    continue
-
-                # MEth0/0/0 IP and Vlanif2 IP
-                m_ip = REGEX_IP_ADDRESS.search(line)
-                if m_ip:
-                    ip = m_ip.group(1)
-                    if current_iface["name"] == "MEth0/0/0":
-                        meta["meth_ip"] = ip
-                    elif current_iface["name"] == "Vlanif2":
-                        meta["vlanif2_ip"] = ip
-                    # continue scanning other lines
-                    # (no continue)
-
-                # Description
-                match_desc = REGEX_DESCRIPTION.search(line)
-                if match_desc:
-                    current_iface["description"] = match_desc.group(1).strip()
-                    continue
-
-                # Link type
-                match_type = REGEX_LINK_TYPE.search(line)
-                if match_type:
-                    current_iface["type"] = match_type.group(1).capitalize()
-                    continue
-
-                # Access VLAN (skip vlan 1 -> keep empty)
-                match_pvid = REGEX_DEFAULT_VLAN.search(line)
-                if match_pvid:
-                    vlan_id = match_pvid.group(1)
-                    if vlan_id != "1":
-                        current_iface["vlan"] = f"Vlan {vlan_id}"
-                    else:
-                        current_iface["vlan"] = ""
-                    continue
-
-                # Trunk VLAN list/range
-                match_trunk = REGEX_TRUNK_ALLOW_VLAN.search(line)
-                if match_trunk:
-                    current_iface["vlan"] = match_trunk.group(1).strip()
-                    continue
-
-                # Eth-Trunk membership
-                match_member = REGEX_ETH_TRUNK_MEMBER.search(line)
-                if match_member:
-                    trunk_id = match_member.group(1)
-                    current_iface["is_trunk_member"] = True
-                    current_iface["trunk_id"] = trunk_id
-                    current_iface["type"] = f"Eth-Trunk {trunk_id} Member"
-                    current_iface["vlan"] = "See Trunk"
-                    continue
-
-                # Shutdown flag
-                if REGEX_SHUTDOWN.search(line):
-                    current_iface["is_shutdown"] = True
+        # block end
+        if token == TOK_BLOCK_END:
+            interfaces[current_iface.name] = current_iface
+            current_iface = None
+
+        # MEth0/0/0 IP and Vlanif2 IP
+        elif token == TOK_IP_ADDRESS:
+            if current_iface.name == "MEth0/0/0":
+                meta["meth_ip"] = value
+            elif current_iface.name == "Vlanif2":
+                meta["vlanif2_ip"] = value
+
+        elif token == TOK_DESCRIPTION:
+            current_iface.description = value
+
+        elif token == TOK_LINK_TYPE:
+            current_iface.type = intern(value)
+
+        # Access VLAN (skip vlan 1 -> keep empty)
+        elif token == TOK_DEFAULT_VLAN:
+            current_iface.vlan = intern(f"Vlan {value}") if value != "1" else ""
+
+        # Trunk VLAN list/range
+        elif token == TOK_TRUNK_ALLOW_VLAN:
+            current_iface.vlan = intern(value)
+
+        # Eth-Trunk membership
+        elif token == TOK_ETH_TRUNK_MEMBER:
+            current_iface.is_trunk_member = True
+            current_iface.trunk_id = intern(value)
+            current_iface.type = intern(f"Eth-Trunk {value} Member")
+            current_iface.vlan = "See Trunk"
+
+        # Shutdown flag
+        elif token == TOK_SHUTDOWN:
+            current_iface.is_shutdown = True
 
     # Save last interface
     if current_iface:
-        interfaces[current_iface["name"]] = current_iface
+        interfaces[current_iface.name] = current_iface
+
+    return meta, interfaces
+
+
+def parse_vrp_config(file_path):
+    """
+    Parses a Huawei VRP configuration file and returns:
+    - meta: hostname, meth_ip, vlanif2_ip
+    - interfaces: dict where keys are Interface Names and values are InterfaceRecords
+    """
+    if not os.path.exists(file_path):
+        print(f"[Error] Configuration file not found: {file_path}")
+        sys.exit(1)
+
+    print(f"[*] Starting lexical analysis of {file_path}...")
+
+    with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+        meta, interfaces = parse_vrp_lines(f)
 
     print(f"[*] Parsing complete. Identified {len(interfaces)} interface definitions.")
     return meta, interfaces
 
 # ==============================================================================
-# SECTION 3: REPORTING ENGINE
+# SECTION 5: REPORTING ENGINE
 # ==============================================================================
 
-def generate_excel_report(meta, interface_data, template_path, output_path):
+# Cells whose text could be an interface name (same charset as REGEX_INTERFACE_START)
+ANCHOR_NAME = re.compile(r"[\w\/\.\-]+")
+ANCHOR_INDEX_SUFFIX = ".anchors.json"
+
+def build_anchor_index(ws):
+    """
+    Scan the template grid once and map every cell text that could be an
+    interface name to its [(row, col), ...] positions.
+    """
+    anchors = {}
+    for row in ws.iter_rows():
+        for cell in row:
+            cell_val = str(cell.value).strip() if cell.value else ""
+            if cell_val and ANCHOR_NAME.fullmatch(cell_val):
+                anchors.setdefault(cell_val, []).append((cell.row, cell.column))
+    return anchors
+
+
+def template_hash(template_path):
+    sha = hashlib.sha256()
+    with open(template_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def load_anchor_index(template_path, ws=None):
+    """
+    Return the anchor index for a template, using the sidecar cache
+    (<template>.anchors.json) when its hash matches the template on disk.
+    On a miss the grid is scanned once (ws, or the template's active sheet)
+    and the sidecar is rewritten.
+    """
+    digest = template_hash(template_path)
+    index_path = template_path + ANCHOR_INDEX_SUFFIX
+
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("sha256") == digest:
+            return {name: [tuple(pos) for pos in positions]
+                    for name, positions in cached["anchors"].items()}
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+
+    print(f"[*] Building anchor index for {template_path}...")
+    if ws is None:
+        ws = load_workbook(template_path).active
+    anchors = build_anchor_index(ws)
+
+    try:
+        with open(index_path, "w", encoding="utf-8") as f:
+            json.dump({"sha256": digest, "sheet": ws.title, "anchors": anchors}, f)
+    except OSError as e:
+        print(f"[Warn] Could not write anchor index {index_path}: {e}")
+
+    return anchors
+
+
+def fill_template_sheet(ws, meta, interface_data, anchors=None):
+    """
+    Write the B1 header and every interface block into one template worksheet.
+    anchors: index from load_anchor_index(); scanned from ws when omitted.
+    Returns the number of interface anchors that were populated.
+    """
+    # --- Fill B1 with "Hostname | MEth | Vlanif2" (bold) ---
+    hostname = meta.get("hostname", "")
+    meth_ip = meta.get("meth_ip", "")
+    vlanif2_ip = meta.get("vlanif2_ip", "")
+    ws["B1"].value = f"{hostname} | {meth_ip} | {vlanif2_ip}"
+    ws["B1"].font = Font(bold=True)
+
+    if anchors is None:
+        anchors = build_anchor_index(ws)
+
+    updates_count = 0
+    by_canonical = None
+
+    for cell_val, positions in anchors.items():
+        target_iface = interface_data.get(cell_val)
+        if target_iface is None:
+            # Template cells may spell the config's names differently (XGE0/0/1, eth-trunk1)
+            if by_canonical is None:
+                by_canonical = {canonical_name(name): iface for name, iface in interface_data.items()}
+            target_iface = by_canonical.get(canonical_name(cell_val))
+        if target_iface is None:
+            continue
+
+        for row_idx, col_idx in positions:
+            # Description row (N+1)
+            desc_cell = ws.cell(row=row_idx + 1, column=col_idx)
+            desc_text = target_iface["description"].strip() if target_iface["description"] else ""
+
+            # Your rule: if shutdown -> write "Shutdown" in description
+            if target_iface["is_shutdown"]:
+                if desc_text:
+                    desc_text = f"{desc_text} | Shutdown"
+                else:
+                    desc_text = "Shutdown"
+
+            desc_cell.value = desc_text
+
+            # Port type row (N+2) - no "(Down)" here anymore
+            type_cell = ws.cell(row=row_idx + 2, column=col_idx)
+            type_cell.value = target_iface["type"]
+
+            # VLAN row (N+3) - empty if not configured
+            vlan_cell = ws.cell(row=row_idx + 3, column=col_idx)
+            vlan_val = target_iface["vlan"]
+            if vlan_val == "1":
+                vlan_val = ""
+            vlan_cell.value = vlan_val
+
+            updates_count += 1
+
+    return updates_count
+
+
+def generate_excel_report(meta, interface_data, template_path, output_path, anchors=None):
     """
     Populate Book1.xlsx template:
     - A1 must contain "Hostname:" (already in template)
@@ -154,6 +432,8 @@ def generate_excel_report(meta, interface_data, template_path, output_path):
         row+1: Description (add "Shutdown" if shutdown)
         row+2: Port type
         row+3: Vlan ID (empty if no VLAN)
+    Anchor cells come from the cached template index (see load_anchor_index).
+    Returns False if the report could not be saved.
     """
     if not os.path.exists(template_path):
         print(f"[Error] Template file not found: {template_path}")
@@ -168,79 +448,535 @@ def generate_excel_report(meta, interface_data, template_path, output_path):
         print(f"[Error] Failed to load Excel: {e}")
         sys.exit(1)
 
-    # --- Fill B1 with "Hostname | MEth | Vlanif2" (bold) ---
+    if anchors is None:
+        anchors = load_anchor_index(template_path, ws)
+
+    updates_count = fill_template_sheet(ws, meta, interface_data, anchors)
+
+    print(f"[*] Report generation complete. Populated data for {updates_count} interfaces.")
+
+    try:
+        wb.save(output_path)
+        print(f"[*] Success! Report saved to: {output_path}")
+        return True
+    except PermissionError:
+        print(f"[Error] Permission denied. Is {output_path} open in Excel?")
+        return False
+
+FLAT_COLUMNS = ["Hostname", "Interface", "Description", "Port Type", "VLAN", "Shutdown", "Eth-Trunk"]
+
+
+def interface_rows(meta, interface_data):
+    """Flat report rows for one device, produced lazily."""
     hostname = meta.get("hostname", "")
-    meth_ip = meta.get("meth_ip", "")
-    vlanif2_ip = meta.get("vlanif2_ip", "")
-    ws["B1"].value = f"{hostname} | {meth_ip} | {vlanif2_ip}"
-    ws["B1"].font = Font(bold=True)
+    for name, iface in interface_data.items():
+        vlan = iface["vlan"] if iface["vlan"] != "1" else ""
+        trunk = f"Eth-Trunk{iface['trunk_id']}" if iface["is_trunk_member"] else ""
+        yield (hostname, name, iface["description"], iface["type"], vlan,
+               "Shutdown" if iface["is_shutdown"] else "", trunk)
 
-    updates_count = 0
-    print("[*] Scanning spreadsheet grid for Interface Anchors...")
 
-    for row in ws.iter_rows():
-        for cell in row:
-            cell_val = str(cell.value).strip() if cell.value else ""
-            if cell_val in interface_data:
-                target_iface = interface_data[cell_val]
+def open_flat_export(output_path):
+    """
+    Streaming (constant-memory) flat export: one row per interface, any
+    number of devices, column widths fitted as rows are written.
+    Returns (workbook, sheet); append interface_rows() and close the workbook.
+    """
+    wb = StreamingWorkbook(output_path)
+    return wb, wb.add_sheet("Interfaces", FLAT_COLUMNS)
+
+# ==============================================================================
+# SECTION 6: INCREMENTAL RE-AUDIT
+# ==============================================================================
 
-                row_idx = cell.row
-                col_idx = cell.column
+# Fields compared between snapshots -> column label in the change report
+DIFF_FIELDS = (
+    ("description", "Description"),
+    ("type", "Port Type"),
+    ("vlan", "VLAN"),
+    ("is_shutdown", "Shutdown"),
+    ("trunk_id", "Eth-Trunk"),
+)
+META_FIELDS = (
+    ("hostname", "Hostname"),
+    ("meth_ip", "MEth IP"),
+    ("vlanif2_ip", "Vlanif2 IP"),
+)
+EMPTY_INTERFACE = InterfaceRecord("", type="")
+
+
+def iter_vrp_blocks(lines):
+    """
+    Split a VRP config on the same boundaries parse_vrp_lines uses.
+    Yields (TOK_SYSNAME, hostname) and (TOK_INTERFACE, name, [stripped lines]).
+    """
+    name = None
+    block = None
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+
+        keyword = line.split(None, 1)[0]
+        if keyword == "sysname":
+            token = _lex_sysname(line[len(keyword):])
+            if token:
+                yield TOK_SYSNAME, token[1]
+                continue
+        elif keyword == "interface":
+            token = _lex_interface(line[len(keyword):])
+            if token:
+                if block is not None:
+                    yield TOK_INTERFACE, name, block
+                name, block = token[1], [line]
+                continue
+        elif line == "#" and block is not None:
+            yield TOK_INTERFACE, name, block
+            block = None
+            continue
 
-                # Description row (N+1)
-                desc_cell = ws.cell(row=row_idx + 1, column=col_idx)
-                desc_text = target_iface["description"].strip() if target_iface["description"] else ""
+        if block is not None:
+            block.append(line)
 
-                # Your rule: if shutdown -> write "Shutdown" in description
-                if target_iface["is_shutdown"]:
-                    if desc_text:
-                        desc_text = f"{desc_text} | Shutdown"
-                    else:
-                        desc_text = "Shutdown"
+    if block is not None:
+        yield TOK_INTERFACE, name, block
 
-                desc_cell.value = desc_text
 
-                # Port type row (N+2) - no "(Down)" here anymore
-                type_cell = ws.cell(row=row_idx + 2, column=col_idx)
-                type_cell.value = target_iface["type"]
+def _cache_path(cache_dir, file_path):
+    # Keyed by the full path: several exports are all called vrpcfg.cfg
+    key = hashlib.sha1(os.path.abspath(file_path).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(cache_dir, f"{os.path.basename(file_path)}.{key}.blocks.json")
 
-                # VLAN row (N+3) - empty if not configured
-                vlan_cell = ws.cell(row=row_idx + 3, column=col_idx)
-                vlan_val = target_iface["vlan"]
-                if vlan_val == "1":
-                    vlan_val = ""
-                vlan_cell.value = vlan_val
 
-                updates_count += 1
+def _diff_interface(name, old, new):
+    changes = []
+    for field, label in DIFF_FIELDS:
+        if old.get(field) != new.get(field):
+            changes.append({"interface": name, "change": "modified", "field": label,
+                            "old": old.get(field), "new": new.get(field)})
+    return changes
 
-    print(f"[*] Report generation complete. Populated data for {updates_count} interfaces.")
+
+def parse_vrp_config_incremental(file_path, cache_dir):
+    """
+    Like parse_vrp_config, but keeps a per-device cache of interface-block
+    hashes in cache_dir and only reparses blocks whose content changed.
+    Returns (meta, interfaces, changes). changes is None on the first run
+    (no baseline), otherwise a list of dicts:
+    {"interface", "change": added|removed|modified, "field", "old", "new"}.
+    """
+    if not os.path.exists(file_path):
+        print(f"[Error] Configuration file not found: {file_path}")
+        sys.exit(1)
+
+    cache_path = _cache_path(cache_dir, file_path)
+    baseline = None
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    except (OSError, ValueError):
+        pass
+
+    old_blocks = baseline["blocks"] if baseline else {}
+    meta = {"hostname": "", "meth_ip": "", "vlanif2_ip": ""}
+    interfaces = {}
+    new_blocks = {}
+    changes = []
+    reparsed = 0
+
+    print(f"[*] Starting incremental analysis of {file_path}...")
+
+    with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+        for item in iter_vrp_blocks(f):
+            if item[0] == TOK_SYSNAME:
+                meta["hostname"] = item[1]
+                continue
+
+            _, name, block = item
+            digest = hashlib.sha1("\n".join(block).encode("utf-8")).hexdigest()
+            cached = old_blocks.get(name)
+
+            if cached and cached[0] == digest:
+                record, fragment = InterfaceRecord.from_dict(cached[1]), cached[2]
+            else:
+                block_meta, parsed = parse_vrp_lines(block)
+                record = parsed[name]
+                fragment = {k: block_meta[k] for k in ("meth_ip", "vlanif2_ip") if block_meta[k]}
+                reparsed += 1
+                if baseline:
+                    if cached:
+                        changes.extend(_diff_interface(name, cached[1], record))
+                    elif name not in new_blocks:
+                        changes.append({"interface": name, "change": "added", "field": "",
+                                        "old": "", "new": record["type"]})
+
+            interfaces[name] = record
+            meta.update(fragment)
+            new_blocks[name] = [digest, record.as_dict(), fragment]
+
+    if baseline:
+        for name in old_blocks.keys() - new_blocks.keys():
+            changes.append({"interface": name, "change": "removed", "field": "",
+                            "old": old_blocks[name][1]["type"], "new": ""})
+        for field, label in META_FIELDS:
+            if baseline["meta"].get(field) != meta[field]:
+                changes.append({"interface": "(device)", "change": "modified", "field": label,
+                                "old": baseline["meta"].get(field), "new": meta[field]})
+
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = cache_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"file": os.path.abspath(file_path), "meta": meta, "blocks": new_blocks}, f)
+    os.replace(tmp_path, cache_path)
+
+    status = f"{len(changes)} changes" if baseline else "baseline created"
+    print(f"[*] Parsing complete. {len(interfaces)} interfaces, {reparsed} blocks reparsed, {status}.")
+    return meta, interfaces, (changes if baseline else None)
+
+
+def write_change_report(changes, output_path):
+    """Write the snapshot diff as CSV (one row per changed field)."""
+    with open(output_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Interface", "Change", "Field", "Old", "New"])
+        for c in changes:
+            writer.writerow([c["interface"], c["change"], c["field"], c["old"], c["new"]])
+    print(f"[*] Change report ({len(changes)} entries) saved to: {output_path}")
+
+
+def refresh_excel_report(meta, interface_data, changes, template_path, output_path, anchors=None):
+    """
+    Rewrite only the changed interface blocks of an existing report.
+    Falls back to a full generate_excel_report when there is no baseline, no
+    previous report, or the template is newer than the report.
+    Returns False if the report could not be saved.
+    """
+    if (changes is None or not os.path.exists(output_path)
+            or os.path.getmtime(template_path) > os.path.getmtime(output_path)):
+        return generate_excel_report(meta, interface_data, template_path, output_path, anchors)
+
+    if not changes:
+        print(f"[*] No changes since last run. Report kept: {output_path}")
+        return True
+
+    if anchors is None:
+        anchors = load_anchor_index(template_path)
+
+    changed = {c["interface"] for c in changes if c["interface"] != "(device)"}
+    subset = {name: interface_data.get(name, EMPTY_INTERFACE) for name in changed}
+
+    wb = load_workbook(output_path)
+    updates_count = fill_template_sheet(wb.active, meta, subset, anchors)
+    print(f"[*] Incremental update complete. Rewrote {updates_count} interface blocks.")
 
     try:
         wb.save(output_path)
         print(f"[*] Success! Report saved to: {output_path}")
+        return True
+    except PermissionError:
+        print(f"[Error] Permission denied. Is {output_path} open in Excel?")
+        return False
+
+
+def run_incremental_audit(config_path, template_path, output_path, cache_dir, anchors=None):
+    """Incremental single-device audit: parse changed blocks, diff, patch the report."""
+    meta, data, changes = parse_vrp_config_incremental(config_path, cache_dir)
+    if changes is not None:
+        base = os.path.splitext(output_path)[0]
+        write_change_report(changes, f"{base}_Changes.csv")
+    refresh_excel_report(meta, data, changes, template_path, output_path, anchors)
+    return meta, data, changes
+
+# ==============================================================================
+# SECTION 7: BATCH (MULTI-DEVICE) AUDIT
+# ==============================================================================
+
+CONFIG_EXTENSIONS = (".cfg", ".txt", ".log")
+INVALID_SHEET_CHARS = re.compile(r"[\[\]\:\*\?\/\\]")
+
+
+def collect_config_files(inputs):
+    """Expand directories and glob patterns into a sorted, de-duplicated file list."""
+    files = []
+    for item in inputs:
+        if os.path.isdir(item):
+            for name in sorted(os.listdir(item)):
+                path = os.path.join(item, name)
+                if os.path.isfile(path) and name.lower().endswith(CONFIG_EXTENSIONS):
+                    files.append(path)
+        elif any(ch in item for ch in "*?["):
+            files.extend(p for p in sorted(glob.glob(item)) if os.path.isfile(p))
+        elif os.path.isfile(item):
+            files.append(item)
+        else:
+            print(f"[Warn] No configuration found for: {item}")
+
+    seen = set()
+    unique = []
+    for path in files:
+        key = os.path.abspath(path)
+        if key not in seen:
+            seen.add(key)
+            unique.append(path)
+    return unique
+
+
+def device_label(meta, config_path):
+    """Hostname from the config, falling back to the file name."""
+    return meta.get("hostname") or os.path.splitext(os.path.basename(config_path))[0]
+
+
+def config_sysname(config_path):
+    """The hostname parse_vrp_lines would report (last sysname), without parsing the rest."""
+    hostname = ""
+    with open(config_path, "r", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            parts = line.split(None, 2)
+            if len(parts) > 1 and parts[0] == TOK_SYSNAME:
+                hostname = parts[1]
+    return hostname
+
+
+def _unique_label(label, used):
+    # Output files are per label: a repeated sysname (or file name) gets _2, _3 ...
+    # (case-insensitively, as on Windows file systems)
+    candidate = label
+    n = 2
+    while candidate.lower() in used:
+        candidate = f"{label}_{n}"
+        n += 1
+    used.add(candidate.lower())
+    return candidate
+
+
+def _quiet_parse(config_path, cache_dir=None, output_dir=".", label=None):
+    # Worker entry point: keep the per-file progress chatter out of the batch log
+    with contextlib.redirect_stdout(io.StringIO()):
+        if not cache_dir:
+            return parse_vrp_config(config_path)
+        meta, data, changes = parse_vrp_config_incremental(config_path, cache_dir)
+        if changes is not None:
+            label = label or device_label(meta, config_path)
+            write_change_report(changes, os.path.join(output_dir, f"{label}_Interface_Audit_Changes.csv"))
+        return meta, data
+
+
+def _audit_one_device(config_path, template_path, output_dir, anchors, cache_dir=None, label=None):
+    # Worker entry point for one-workbook-per-device mode: parse + fill + save.
+    # label is made unique by the parent; a failed save is raised, not just printed
+    # (the print would be swallowed along with the progress chatter)
+    with contextlib.redirect_stdout(io.StringIO()):
+        if cache_dir:
+            meta, data, changes = parse_vrp_config_incremental(config_path, cache_dir)
+        else:
+            meta, data = parse_vrp_config(config_path)
+
+        label = label or device_label(meta, config_path)
+        output_path = os.path.join(output_dir, f"{label}_Interface_Audit.xlsx")
+
+        if cache_dir:
+            if changes is not None:
+                write_change_report(changes, os.path.splitext(output_path)[0] + "_Changes.csv")
+            saved = refresh_excel_report(meta, data, changes, template_path, output_path, anchors)
+        else:
+            saved = generate_excel_report(meta, data, template_path, output_path, anchors)
+    if not saved:
+        raise PermissionError(f"Permission denied. Is {output_path} open in Excel?")
+    return label, len(data), output_path
+
+
+def _unique_sheet_title(label, used):
+    title = INVALID_SHEET_CHARS.sub("_", label)[:31] or "Device"
+    candidate = title
+    n = 2
+    while candidate.lower() in used:
+        suffix = f"_{n}"
+        candidate = title[:31 - len(suffix)] + suffix
+        n += 1
+    used.add(candidate.lower())
+    return candidate
+
+
+def run_batch_audit(inputs, template_path, output_dir=".", single_workbook=None, workers=None,
+                    cache_dir=None, flat_export=None):
+    """
+    Audit many VRP configs in one invocation.
+    - inputs: directories, glob patterns or file paths
+    - single_workbook: if set, write every device as its own sheet into this file;
+      otherwise write <hostname>_Interface_Audit.xlsx per device into output_dir
+    - workers: process pool size (default: os.cpu_count())
+    - cache_dir: enable incremental re-audit (see parse_vrp_config_incremental)
+    - flat_export: instead of template workbooks, stream every device's rows
+      into one flat sheet as each parse finishes
+    """
+    config_files = collect_config_files(inputs)
+    if not config_files:
+        print("[Error] No configuration files matched the batch input.")
+        return []
+
+    os.makedirs(output_dir, exist_ok=True)
+    parse_only = bool(single_workbook or flat_export)
+    anchors = None
+
+    if not flat_export:
+        if not os.path.exists(template_path):
+            print(f"[Error] Template file not found: {template_path}")
+            sys.exit(1)
+        # Resolve anchors once up front so workers never rescan (or race on) the sidecar
+        anchors = load_anchor_index(template_path)
+
+    flat_wb = flat_sheet = None
+    if flat_export:
+        flat_path = os.path.join(output_dir, flat_export)
+        flat_wb, flat_sheet = open_flat_export(flat_path)
+
+    print(f"[*] Batch audit of {len(config_files)} configurations with {workers or os.cpu_count()} workers...")
+
+    # Per-device output files are named by label: settle them before any worker
+    # writes, so two configs with the same sysname never share a path
+    labels = {}
+    if not parse_only or cache_dir:
+        used_labels = set()
+        for path in config_files:
+            label = config_sysname(path) or device_label({}, path)
+            labels[path] = _unique_label(label, used_labels)
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        if parse_only:
+            futures = {
+                pool.submit(_quiet_parse, path, cache_dir, output_dir, labels.get(path)): path
+                for path in config_files
+            }
+        else:
+            futures = {
+                pool.submit(_audit_one_device, path, template_path, output_dir, anchors, cache_dir,
+                            labels[path]): path
+                for path in config_files
+            }
+
+        parsed = {}
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                result = future.result()
+            except (Exception, SystemExit) as e:  # parse_vrp_config exits on missing files
+                print(f"[Error] {path}: {e!r}")
+                continue
+
+            if flat_export:
+                meta, data = result
+                label = device_label(meta, path)
+                flat_sheet.extend(interface_rows(dict(meta, hostname=label), data))
+                results.append((label, len(data), flat_path))
+                print(f"    [+] {label}: {len(data)} interfaces streamed")
+            elif single_workbook:
+                parsed[path] = result
+                print(f"    [+] Parsed {device_label(result[0], path)} ({len(result[1])} interfaces)")
+            else:
+                results.append(result)
+                label, count, output_path = result
+                print(f"    [+] {label}: {count} interfaces -> {output_path}")
+
+    if flat_export:
+        flat_wb.close()
+        print(f"[*] Success! Flat report ({flat_sheet.rows - 1} rows) saved to: {flat_path}")
+    elif single_workbook:
+        results = _write_multi_sheet_workbook(config_files, parsed, template_path, anchors,
+                                              os.path.join(output_dir, single_workbook))
+
+    print(f"[*] Batch audit complete. {len(results)}/{len(config_files)} devices reported.")
+    return results
+
+
+def _write_multi_sheet_workbook(config_files, parsed, template_path, anchors, output_path):
+    # Keep input order so sheet order is stable between runs
+    wb = load_workbook(template_path)
+    template_ws = wb.active
+    used_titles = {ws.title.lower() for ws in wb.worksheets}
+    results = []
+
+    for path in config_files:
+        if path not in parsed:
+            continue
+        meta, data = parsed[path]
+        label = device_label(meta, path)
+        ws = wb.copy_worksheet(template_ws)
+        ws.title = _unique_sheet_title(label, used_titles)
+        count = fill_template_sheet(ws, meta, data, anchors)
+        results.append((label, count, output_path))
+
+    if results:
+        wb.remove(template_ws)
+
+    try:
+        wb.save(output_path)
+        print(f"[*] Success! Multi-device report saved to: {output_path}")
     except PermissionError:
         print(f"[Error] Permission denied. Is {output_path} open in Excel?")
+    return results
 
 # ==============================================================================
-# SECTION 4: MAIN
+# SECTION 8: MAIN
 # ==============================================================================
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Huawei VRP Interface Audit Tool")
+    parser.add_argument("inputs", nargs="*",
+                        help="Config files, directories or glob patterns (enables batch mode)")
+    parser.add_argument("-t", "--template", help="Excel template (default: excel.xlsx / Book1.xlsx)")
+    parser.add_argument("-o", "--output-dir", default=".", help="Batch mode output directory")
+    parser.add_argument("--single-workbook", metavar="FILE",
+                        help="Batch mode: write all devices as sheets of one workbook")
+    parser.add_argument("-j", "--workers", type=int, help="Batch mode process pool size")
+    parser.add_argument("--flat-export", metavar="FILE",
+                        help="Stream one flat Interfaces sheet (constant memory) instead of "
+                             "filling the template")
+    parser.add_argument("--incremental", metavar="CACHE_DIR",
+                        help="Only reparse/rewrite interface blocks changed since the last run "
+                             "and write a *_Changes.csv diff report")
+    return parser.parse_args(argv)
+
+
 def main():
+    args = parse_args()
+
     INPUT_CONFIG = "switch config.txt"
-    INPUT_TEMPLATE = "excel.xlsx"
+    INPUT_TEMPLATE = args.template or "excel.xlsx"
     OUTPUT_FILE = "Huawei_Interface_Audit.xlsx"
 
     if not os.path.exists(INPUT_CONFIG) and os.path.exists("vrpcfg.cfg"):
         INPUT_CONFIG = "vrpcfg.cfg"
 
-    if not os.path.exists(INPUT_TEMPLATE) and os.path.exists("Book1.xlsx"):
+    if not args.template and not os.path.exists(INPUT_TEMPLATE) and os.path.exists("Book1.xlsx"):
         INPUT_TEMPLATE = "Book1.xlsx"
 
     print("--- Huawei VRP Interface Audit Tool ---")
+
+    if args.inputs:
+        print(f"Batch Input: {', '.join(args.inputs)}")
+        print(f"Target Template: {INPUT_TEMPLATE}")
+        print("-" * 40)
+        run_batch_audit(args.inputs, INPUT_TEMPLATE, args.output_dir,
+                        args.single_workbook, args.workers, args.incremental, args.flat_export)
+        return
+
     print(f"Target Config: {INPUT_CONFIG}")
     print(f"Target Template: {INPUT_TEMPLATE}")
     print("-" * 40)
 
+    if args.flat_export:
+        meta, data = parse_vrp_config(INPUT_CONFIG)
+        wb, sheet = open_flat_export(args.flat_export)
+        with wb:
+            sheet.extend(interface_rows(meta, data))
+        print(f"[*] Success! Flat report saved to: {args.flat_export}")
+        return
+
+    if args.incremental:
+        run_incremental_audit(INPUT_CONFIG, INPUT_TEMPLATE, OUTPUT_FILE, args.incremental)
+        return
+
     meta, data = parse_vrp_config(INPUT_CONFIG)
     generate_excel_report(meta, data, INPUT_TEMPLATE, OUTPUT_FILE)
 
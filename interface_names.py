@@ -0,0 +1,98 @@
+import re
+import sys
+from collections import namedtuple
+from functools import lru_cache
+
+# ==============================================================================
+# INTERFACE NAME NORMALIZER
+#
+# One place that splits and normalizes interface names for every parser:
+#   canonicalize("XGE0/0/1")     -> ('XGigabitEthernet', '0/0', '1', 'XGigabitEthernet0/0/1')
+#   canonicalize("ge1/0/1")      -> ('GE', '1/0', '1', 'GE1/0/1')     (VRP8 native, kept)
+#   canonicalize("100GE1/0/6")   -> ('100GE', '1/0', '6', '100GE1/0/6')
+#   canonicalize("eth-trunk23")  -> ('Eth-Trunk', '', '23', 'Eth-Trunk23')
+#   canonicalize("xe-0/0/1.0")   -> ('xe', '0/0', '1.0', 'xe-0/0/1.0')        (Juniper)
+# Results are LRU-memoized: a fleet repeats the same few thousand names.
+# Parsers keep each device's own spelling in their records and output; the
+# canonical form is only for matching names across sources (joins, lookups).
+#
+#   python interface_names.py GE1/0/1 XGE0/0/2 ae0.100
+# ==============================================================================
+
+# Characters an interface name can contain (config lines, template cells, CLI tables)
+INTERFACE_NAME_CHARS = r"[\w\/\.\-:]+"
+
+# Huawei: [TYPE][a/b/c][.sub], e.g. 100GE1/0/6, Eth-Trunk10.100, GigabitEthernet0/5/3
+HUAWEI_NAME = re.compile(r'^(\d*[A-Za-z][A-Za-z\-]*?)(\d+(?:/\d+)*)(\.\d+)?$')
+# Juniper: type-fpc/pic/port[:channel][.unit] or ae0 / lo0.0 / irb.100 style logical names
+JUNIPER_PHYSICAL = re.compile(r'^([a-z]{2,4})-(\d+/\d+/\d+)(:\d+)?(\.\d+)?$')
+JUNIPER_LOGICAL = re.compile(r'^(ae|reth|lo|irb|vlan|em|me|fxp|vme)(\d*)(\.\d+)?$')
+
+# Abbreviations and case variants -> the name VRP prints in configurations.
+# GE is a native VRP8 type (CE GE1/0/1), not an abbreviation of GigabitEthernet.
+HUAWEI_TYPES = {name.lower(): name for name in [
+    'GigabitEthernet', 'XGigabitEthernet', 'MultiGE', 'Ethernet', 'MEth',
+    'GE', '10GE', '25GE', '40GE', '50GE', '100GE', '200GE', '400GE',
+    'Eth-Trunk', 'Vlanif', 'LoopBack', 'NULL', 'Tunnel', 'Vbdif', 'Nve', 'Stack-Port',
+]}
+HUAWEI_TYPES.update({
+    'xge': 'XGigabitEthernet',
+    'eth': 'Ethernet',
+    'loop': 'LoopBack',
+    'vlan-interface': 'Vlanif',
+})
+
+CACHE_SIZE = 1 << 16
+
+InterfaceName = namedtuple("InterfaceName", ["type", "slot", "port", "canonical"])
+InterfaceName.__doc__ = """
+type: 'GigabitEthernet', '100GE', 'Eth-Trunk', 'xe', 'ae' ...  ('' when unrecognised)
+slot: numbering before the port ('1/0' of 100GE1/0/6, '' for Eth-Trunk23)
+port: last number plus any sub-interface / unit / channel suffix
+canonical: normalized full name (the input itself when unrecognised)
+"""
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def canonicalize(name):
+    """(type, slot, port, canonical) for a Huawei or Juniper interface name"""
+    name = name.strip() if name else ""
+
+    match = JUNIPER_PHYSICAL.match(name)
+    if match:
+        kind, numbering, channel, unit = match.groups()
+        slot, port = numbering.rsplit('/', 1)
+        return InterfaceName(kind, slot, port + (channel or '') + (unit or ''), name)
+
+    match = JUNIPER_LOGICAL.match(name)
+    if match:
+        kind, number, unit = match.groups()
+        return InterfaceName(kind, '', number + (unit or ''), name)
+
+    match = HUAWEI_NAME.match(name)
+    if match:
+        kind, numbering, sub = match.groups()
+        kind = HUAWEI_TYPES.get(kind.lower(), kind)
+        slot, _, port = numbering.rpartition('/')
+        return InterfaceName(kind, slot, port + (sub or ''), kind + numbering + (sub or ''))
+
+    return InterfaceName('', '', '', name)
+
+
+def canonical_name(name):
+    return canonicalize(name).canonical
+
+
+def numbering(name):
+    """Everything after the type: '1/0/6' for 100GE1/0/6, '0/0/1.0' for xe-0/0/1.0"""
+    parsed = canonicalize(name)
+    return f"{parsed.slot}/{parsed.port}" if parsed.slot else parsed.port
+
+
+def main():
+    for name in sys.argv[1:]:
+        print("\t".join([name, *canonicalize(name)]))
+
+
+if __name__ == "__main__":
+    main()
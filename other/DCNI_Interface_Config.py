@@ -1,7 +1,35 @@
+import io
+import os
 import re
+import sys
+import argparse
+import tempfile
 import pandas as pd
-from typing import List, Dict, Any, Optional
-
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Tuple, Union, TextIO
+
+# Shared helpers (vlan_index.py, ...) live in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from vlan_index import VlanIndex
+from xlsx_stream import StreamingWorkbook
+from capture_store import CaptureStore
+from interface_names import canonicalize, numbering
+
+HOSTNAME_PROMPT = re.compile(r'<(\S+)>display')
+DEVICE_PROMPT = re.compile(r'^<([^<>\s]+)>')
+STATUS_HEADER = re.compile(r'Interface\s+PHY\s+Protocol Description')
+STATUS_LINE = re.compile(r'^(\S+)\s+(\S+)\s+(\S+)(?:\s+(.*))?$')
+LLDP_HEADER = re.compile(r'Local Interface\s+Exptime\(s\) Neighbor Interface\s+Neighbor Device')
+LLDP_COLUMN_GAP = re.compile(r'\s{2,}')
+# Columns of _status_record rows, so a log without the status table still joins
+STATUS_COLUMNS = ['Interface', 'Interface Slot', 'Interface Port', 'PHY', 'Protocol', 'Description']
+
+# The command outputs a report needs, fetched by key from a capture store
+REPORT_COMMANDS = [
+    'display interface description',
+    'display lldp neighbor brief',
+    'display current-configuration interface'
+]
 
 class NetworkConfigParser:
     """Class for parsing network configuration data from switches"""
@@ -20,18 +48,16 @@ class NetworkConfigParser:
         - 100GE7/0/0 → ('100GE', '7/0/0')
         - 100GE1/4/0/6 → ('100GE', '1/4/0/6')
         - Eth-Trunk23 → ('Eth-Trunk', '23')
+        - xe-0/0/1.0 → ('xe', '0/0/1.0')   (Juniper)
         """
         if not interface:
             return "", ""
 
-        # Handle Eth-Trunk cases
-        #if interface.startswith('Eth-Trunk'):
-        #    return 'Eth-Trunk', interface[9:]  # Remove 'Eth-Trunk' prefix
-
-        # Handle interfaces with format: [TYPE][NUMBER]/... (e.g., 100GE7/0/0)
-        match = re.match(r'^(\d*[A-Za-z]+)(\d+/\d+/\d+/\d+|\d+/\d+/\d+|\d+/\d+|\d+)$', interface)
-        if match:
-            return match.group(1), match.group(2)
+        # Huawei / Juniper names via the shared memoized normalizer; the type
+        # keeps the device's spelling (GE stays GE)
+        if canonicalize(interface).type:
+            number = numbering(interface)
+            return interface[:len(interface) - len(number)].rstrip('-'), number
 
         # Fallback for other formats
         parts = interface.split('/', 1)
@@ -39,107 +65,104 @@ class NetworkConfigParser:
             return parts[0].rstrip('/'), parts[1]
         return interface, ''  # Final fallback
 
-    def parse_interfaces(self, text: str) -> List[Dict[str, str]]:
-        """Parse interface status information with dynamic hostname handling"""
-        interfaces = []
-        pattern = r'^(\S+)\s+(\S+)\s+(\S+)(?:\s+(.*))?$'
-
-        if not self.hostname:
-            self.hostname = self._extract_hostname(text)
-
-        interface_section = re.search(
-            rf'Interface\s+PHY\s+Protocol Description(.*?)<{self.hostname}>',
-            text,
-            re.DOTALL
-        )
-
-        if interface_section:
-            for line in interface_section.group(1).split('\n'):
-                if match := re.match(pattern, line.strip()):
-                    interface_name = match.group(1)
-                    slot, port = self._split_interface(interface_name)
-                    interfaces.append({
-                        'Interface': interface_name,
-                        'Interface Slot': slot,
-                        'Interface Port': port,
-                        'PHY': match.group(2),
-                        'Protocol': match.group(3),
-                        'Description': match.group(4) if match.group(4) else ''
-                    })
-        return interfaces
-
-    def parse_lldp(self, text: str) -> List[Dict[str, str]]:
-        """Parse LLDP neighbor information with dynamic hostname handling"""
-        neighbors = []
-
-        if not self.hostname:
-            self.hostname = self._extract_hostname(text)
-
-        lldp_section = re.search(
-            rf'Local Interface\s+Exptime\(s\) Neighbor Interface\s+Neighbor Device(.*?)<{self.hostname}>',
-            text,
-            re.DOTALL
-        )
-
-        if lldp_section:
-            for line in lldp_section.group(1).split('\n'):
-                if line.strip() and not line.startswith('-----'):
-                    parts = re.split(r'\s{2,}', line.strip())
-                    if len(parts) >= 3:
-                        neighbors.append({
-                            'Local Interface': parts[0],
-                            'Neighbor Interface': parts[2],
-                            'Neighbor Device': parts[3] if len(parts) > 3 else ''
-                        })
-        return neighbors
+    def _new_config(self, interface: str) -> Dict[str, Any]:
+        return {
+            'Interface': interface,
+            'Description': '',
+            'Eth-Trunk': '',
+            'Eth-Trunk VLAN': '',
+            'IP Address': '',
+            'Subnet Mask': '',
+            'VLAN': '',
+            'OSPF Area': ''
+        }
+
+    def _status_record(self, line: str) -> Optional[Dict[str, str]]:
+        """One row of 'display interface description'"""
+        match = STATUS_LINE.match(line.strip())
+        if not match:
+            return None
+        interface_name = match.group(1)
+        slot, port = self._split_interface(interface_name)
+        return {
+            'Interface': interface_name,
+            'Interface Slot': slot,
+            'Interface Port': port,
+            'PHY': match.group(2),
+            'Protocol': match.group(3),
+            'Description': match.group(4) if match.group(4) else ''
+        }
+
+    def _lldp_record(self, line: str) -> Optional[Dict[str, str]]:
+        """One row of 'display lldp neighbor brief'"""
+        if not line.strip() or line.startswith('-----'):
+            return None
+        parts = LLDP_COLUMN_GAP.split(line.strip())
+        if len(parts) < 3:
+            return None
+        return {
+            'Local Interface': parts[0],
+            'Neighbor Interface': parts[2],
+            'Neighbor Device': parts[3] if len(parts) > 3 else ''
+        }
+
+    def iter_records(self, lines: Iterable[str]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Single streaming pass over a session log (file object or any line iterable)
+        Yields ('interface', row), ('lldp', row) as their sections are read and
+        ('config', row) at the end, once Eth-Trunk VLAN inheritance is resolved.
+        Sections end at the device prompt, as with the old regex sections.
+        """
+        # Section states: None = header not seen yet, True = inside, False = done
+        in_status = in_lldp = None
+        prompt = f'<{self.hostname}>' if self.hostname else None
 
-    def parse_interface_configs(self, text: str) -> List[Dict[str, Any]]:
-        """Parse detailed interface configurations"""
         configs = []
-        eth_trunk_vlans = {}
+        trunk_vlans = {}          # Eth-Trunk name -> VLAN of its last block
         current_interface = None
         current_config = {}
 
-        # First pass: Collect Eth-Trunk VLAN configurations
-        for line in text.split('\n'):
-            stripped_line = line.strip()
-
-            if stripped_line.startswith('interface '):
-                current_interface = stripped_line[9:].strip()
-                if current_interface.startswith('Eth-Trunk'):
-                    eth_trunk_vlans[current_interface] = {'VLAN': ''}
-
-            elif current_interface and current_interface.startswith('Eth-Trunk'):
-                if stripped_line.startswith('port default vlan '):
-                    eth_trunk_vlans[current_interface]['VLAN'] = stripped_line.split('port default vlan ')[1].strip()
-                elif stripped_line.startswith('port trunk allow-pass vlan '):
-                    eth_trunk_vlans[current_interface]['VLAN'] = stripped_line.split('port trunk allow-pass vlan ')[
-                        1].strip()
-
-        # Second pass: Process all interfaces
-        current_interface = None
-        current_config = {}
-
-        for line in text.split('\n'):
+        for line in lines:
+            line = line.rstrip('\n')
+
+            if prompt is None and (match := HOSTNAME_PROMPT.search(line)):
+                self.hostname = match.group(1)
+                prompt = f'<{self.hostname}>'
+
+            # --- display interface description ---
+            if in_status is None and (match := STATUS_HEADER.search(line)):
+                in_status, status_line = True, line[match.end():]
+            else:
+                status_line = line
+            if in_status:
+                end = status_line.find(prompt) if prompt else -1
+                if end >= 0:
+                    status_line, in_status = status_line[:end], False
+                if record := self._status_record(status_line):
+                    yield 'interface', record
+
+            # --- display lldp neighbor brief ---
+            if in_lldp is None and (match := LLDP_HEADER.search(line)):
+                in_lldp, lldp_line = True, line[match.end():]
+            else:
+                lldp_line = line
+            if in_lldp:
+                end = lldp_line.find(prompt) if prompt else -1
+                if end >= 0:
+                    lldp_line, in_lldp = lldp_line[:end], False
+                if record := self._lldp_record(lldp_line):
+                    yield 'lldp', record
+
+            # --- display current-configuration interface ---
             stripped_line = line.strip()
 
             if stripped_line.startswith('interface '):
                 if current_interface:
-                    if current_config.get('Eth-Trunk') in eth_trunk_vlans:
-                        current_config['Eth-Trunk VLAN'] = eth_trunk_vlans[current_config['Eth-Trunk']]['VLAN']
                     configs.append(current_config)
 
                 current_interface = stripped_line[9:].strip()
-                current_config = {
-                    'Interface': current_interface,
-                    'Description': '',
-                    'Eth-Trunk': '',
-                    'Eth-Trunk VLAN': '',
-                    'IP Address': '',
-                    'Subnet Mask': '',
-                    'VLAN': '',
-                    'OSPF Area': ''
-                }
+                current_config = self._new_config(current_interface)
+                if current_interface.startswith('Eth-Trunk'):
+                    trunk_vlans[current_interface] = ''
 
             elif stripped_line.startswith('description '):
                 current_config['Description'] = stripped_line[len('description '):].strip()
@@ -152,9 +175,13 @@ class NetworkConfigParser:
 
             elif stripped_line.startswith('port default vlan '):
                 current_config['VLAN'] = stripped_line.split('port default vlan ')[1].strip()
+                if current_interface and current_interface.startswith('Eth-Trunk'):
+                    trunk_vlans[current_interface] = current_config['VLAN']
 
             elif stripped_line.startswith('port trunk allow-pass vlan '):
                 current_config['VLAN'] = stripped_line.split('port trunk allow-pass vlan ')[1].strip()
+                if current_interface and current_interface.startswith('Eth-Trunk'):
+                    trunk_vlans[current_interface] = current_config['VLAN']
 
             elif stripped_line.startswith('ospf enable '):
                 parts = stripped_line[len('ospf enable '):].split()
@@ -166,65 +193,116 @@ class NetworkConfigParser:
 
         # Add the last interface
         if current_interface:
-            if current_config.get('Eth-Trunk') in eth_trunk_vlans:
-                current_config['Eth-Trunk VLAN'] = eth_trunk_vlans[current_config['Eth-Trunk']]['VLAN']
             configs.append(current_config)
 
-        return configs
-
-    def generate_excel_report(self, text: str, output_file: Optional[str] = None) -> None:
-        """Generate Excel report from configuration text"""
-        # Extract hostname if not already set
         if not self.hostname:
-            self.hostname = self._extract_hostname(text)
+            self.hostname = "network_configuration"
+
+        # Members inherit the VLAN of their Eth-Trunk's last block
+        for config in configs:
+            if config['Eth-Trunk'] in trunk_vlans:
+                config['Eth-Trunk VLAN'] = trunk_vlans[config['Eth-Trunk']]
+            yield 'config', config
+
+    def parse_stream(self, lines: Iterable[str]) -> Tuple[List[Dict[str, str]], List[Dict[str, str]],
+                                                        List[Dict[str, Any]]]:
+        """Collect (interfaces, neighbors, configs) from one pass of iter_records"""
+        records = {'interface': [], 'lldp': [], 'config': []}
+        for kind, record in self.iter_records(lines):
+            records[kind].append(record)
+        return records['interface'], records['lldp'], records['config']
+
+    def parse_interfaces(self, text: str) -> List[Dict[str, str]]:
+        """Parse interface status information with dynamic hostname handling"""
+        return self.parse_stream(io.StringIO(text))[0]
+
+    def parse_lldp(self, text: str) -> List[Dict[str, str]]:
+        """Parse LLDP neighbor information with dynamic hostname handling"""
+        return self.parse_stream(io.StringIO(text))[1]
+
+    def parse_interface_configs(self, text: str) -> List[Dict[str, Any]]:
+        """Parse detailed interface configurations"""
+        return self.parse_stream(io.StringIO(text))[2]
+
+    def build_vlan_index(self, text: Union[str, TextIO, Iterable[str]],
+                         index: Optional[VlanIndex] = None) -> VlanIndex:
+        """Add this device's VLAN-carrying interfaces to a (fleet-wide) VlanIndex
+        Takes configuration text, an open session log or its lines, like generate_excel_report.
+        Eth-Trunk members are indexed with the VLANs inherited from their trunk.
+        """
+        if index is None:
+            index = VlanIndex()
+
+        lines = io.StringIO(text) if isinstance(text, str) else text
+        for config in self.parse_stream(lines)[2]:
+            index.add(self.hostname, config['Interface'], config['VLAN'] or config['Eth-Trunk VLAN'])
+        return index
+
+    def _split_interface_series(self, interfaces: pd.Series) -> pd.DataFrame:
+        """_split_interface over a column: returns a frame with 'Slot' and 'Port' columns
+        Each distinct name is split once; the rows are filled by lookup."""
+        interfaces = interfaces.astype(str)
+        splits = {name: self._split_interface(name) for name in interfaces.unique()}
+        return pd.DataFrame({
+            'Slot': interfaces.map(lambda name: splits[name][0]),
+            'Port': interfaces.map(lambda name: splits[name][1]),
+        }, index=interfaces.index)
+
+    def _join_interface_data(self, interfaces_df: pd.DataFrame, neighbors_df: pd.DataFrame,
+                             configs_df: pd.DataFrame) -> pd.DataFrame:
+        """interfaces ⋈ LLDP ⋈ configs ⋈ configs-as-trunk, as left merges on the interface name"""
+        neighbor_cols = ['Local Interface', 'Neighbor Interface', 'Neighbor Device']
+        config_cols = ['Interface', 'Eth-Trunk', 'VLAN']
+
+        neighbors = (neighbors_df.reindex(columns=neighbor_cols).astype(object)
+                     .drop_duplicates('Local Interface', keep='last')
+                     .rename(columns={'Local Interface': 'Interface'}))
+        configs = configs_df.reindex(columns=config_cols).astype(object).drop_duplicates('Interface', keep='last')
+        trunks = (configs.loc[configs['Interface'] != '', ['Interface', 'VLAN']]
+                  .rename(columns={'Interface': 'Eth-Trunk', 'VLAN': 'Eth-Trunk VLAN'}))
+
+        joined = (interfaces_df
+                  .merge(neighbors, on='Interface', how='left')
+                  .merge(configs, on='Interface', how='left'))
+        joined[['Neighbor Interface', 'Neighbor Device', 'Eth-Trunk', 'VLAN']] = \
+            joined[['Neighbor Interface', 'Neighbor Device', 'Eth-Trunk', 'VLAN']].fillna('')
+
+        # Members pick up their Eth-Trunk's VLAN; interfaces without a trunk stay ''
+        joined = joined.merge(trunks, on='Eth-Trunk', how='left')
+        joined['Eth-Trunk VLAN'] = joined['Eth-Trunk VLAN'].fillna('')
+
+        joined['Hostname'] = self.hostname
+        joined['Neighbor Interface Slot'] = ''
+        joined['Neighbor Interface Port'] = ''
+        has_neighbor = joined['Neighbor Interface'] != ''
+        if has_neighbor.any():
+            split = self._split_interface_series(joined.loc[has_neighbor, 'Neighbor Interface'])
+            joined.loc[has_neighbor, 'Neighbor Interface Slot'] = split['Slot']
+            joined.loc[has_neighbor, 'Neighbor Interface Port'] = split['Port']
+
+        return joined
+
+    def generate_excel_report(self, text: Union[str, TextIO, Iterable[str]],
+                              output_file: Optional[str] = None, streaming: bool = False) -> None:
+        """Generate Excel report from configuration text, an open session log or its lines
+        A file object is parsed line by line and never read into memory whole.
+        streaming=True writes through xlsxwriter constant_memory with column
+        widths tracked per row, instead of building the openpyxl workbook.
+        """
+        # Parse all data in one pass (this also picks up the hostname)
+        lines = io.StringIO(text) if isinstance(text, str) else text
+        interfaces, neighbors, configs = self.parse_stream(lines)
+        if not interfaces:
+            print(f"[Warn] {self.hostname}: no 'display interface description' output, Interfaces sheet is empty")
+        interfaces_df = pd.DataFrame(interfaces, columns=STATUS_COLUMNS)
+        neighbors_df = pd.DataFrame(neighbors)
+        configs_df = pd.DataFrame(configs)
 
         # Set default output filename using hostname
         if output_file is None:
             output_file = f"{self.hostname}.xlsx"
 
-        # Parse all data
-        interfaces_df = pd.DataFrame(self.parse_interfaces(text))
-        neighbors_df = pd.DataFrame(self.parse_lldp(text))
-        configs_df = pd.DataFrame(self.parse_interface_configs(text))
-
-        # Create lookup dictionaries
-        neighbors_lookup = neighbors_df.set_index('Local Interface').to_dict('index')
-        configs_lookup = configs_df.set_index('Interface').to_dict('index')
-
-        # Initialize all additional columns first
-        interfaces_df['Hostname'] = self.hostname
-        interfaces_df['Neighbor Interface Slot'] = ''
-        interfaces_df['Neighbor Interface Port'] = ''
-        interfaces_df['Neighbor Device'] = ''
-        interfaces_df['Eth-Trunk'] = ''
-        interfaces_df['Eth-Trunk VLAN'] = ''
-        interfaces_df['VLAN'] = ''
-
-        # Fill in the additional columns with direct values
-        for index, row in interfaces_df.iterrows():
-            full_interface = row['Interface']
-
-            # Lookup neighbor info
-            neighbor_data = neighbors_lookup.get(full_interface, {})
-            neighbor_interface = neighbor_data.get('Neighbor Interface', '')
-
-            # Split neighbor interface
-            if neighbor_interface:
-                neighbor_slot, neighbor_port = self._split_interface(neighbor_interface)
-                interfaces_df.at[index, 'Neighbor Interface Slot'] = neighbor_slot
-                interfaces_df.at[index, 'Neighbor Interface Port'] = neighbor_port
-
-            interfaces_df.at[index, 'Neighbor Device'] = neighbor_data.get('Neighbor Device', '')
-
-            # Lookup config info
-            config_data = configs_lookup.get(full_interface, {})
-            interfaces_df.at[index, 'Eth-Trunk'] = config_data.get('Eth-Trunk', '')
-            interfaces_df.at[index, 'VLAN'] = config_data.get('VLAN', '')
-
-            # Lookup Eth-Trunk VLAN if applicable
-            if interfaces_df.at[index, 'Eth-Trunk']:
-                trunk_vlan = configs_lookup.get(interfaces_df.at[index, 'Eth-Trunk'], {}).get('VLAN', '')
-                interfaces_df.at[index, 'Eth-Trunk VLAN'] = trunk_vlan
+        interfaces_df = self._join_interface_data(interfaces_df, neighbors_df, configs_df)
 
         # Define and apply column order
         column_order = [
@@ -235,6 +313,15 @@ class NetworkConfigParser:
 
         interfaces_df = interfaces_df[column_order]
 
+        if streaming:
+            self._write_streaming_report(output_file, {
+                'Interfaces': interfaces_df,
+                'LLDP Neighbors': neighbors_df,
+                'Interface Configs': configs_df,
+            })
+            print(f"Excel report generated successfully: {output_file}")
+            return
+
         # Save to Excel
         with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
             # Write data to sheets
@@ -266,14 +353,175 @@ class NetworkConfigParser:
         print(f"Excel report generated successfully: {output_file}")
 
 
-def main():
+    @staticmethod
+    def _write_streaming_report(output_file: str, sheets: Dict[str, pd.DataFrame]) -> None:
+        """Stream DataFrames row by row; widths are fitted as rows are written"""
+        with StreamingWorkbook(output_file) as wb:
+            for sheet_name, df in sheets.items():
+                sheet = wb.add_sheet(sheet_name, [str(c) for c in df.columns])
+                sheet.extend(df.itertuples(index=False, name=None))
+
+
+def split_session_log(lines: Iterable[str], spool_dir: str) -> Dict[str, str]:
+    """Segment a session log (e.g. from the AN_*/MCN_* stelnet collectors) by device prompt
+    Every line belongs to the device whose <HOSTNAME> prompt was seen last; lines before
+    the first prompt are login banner. Each device's lines are spooled to its own file
+    in spool_dir as they are read, so the log is never held in memory. Returns
+    {hostname: segment file} for the devices that ran a display command, so jump
+    hosts that just stelnet onwards are left out.
+    """
+    segments = {}
+    reported = set()
+    hostname = None
+    out = None
+
+    try:
+        for line in lines:
+            match = DEVICE_PROMPT.match(line)
+            if match:
+                hostname = match.group(1)
+                if line[match.end():].startswith('display'):
+                    reported.add(hostname)
+                if hostname not in segments:
+                    # Numbered, not named by hostname: prompts may hold characters a path cannot
+                    path = os.path.join(spool_dir, f"{len(segments):05d}.log")
+                    segments[hostname] = (path, open(path, 'w', encoding='utf-8', newline=''))
+                out = segments[hostname][1]
+            if out is not None:
+                out.write(line)
+    finally:
+        for _, f in segments.values():
+            f.close()
+
+    for host, (path, _) in segments.items():
+        if host not in reported:
+            os.remove(path)
+    return {host: path for host, (path, _) in segments.items() if host in reported}
+
+
+def _report_device(hostname: str, lines: Union[str, List[str]], output_dir: str, streaming: bool) -> str:
+    """Worker: one parser instance per device block (its lines, or the file they were spooled to)"""
     parser = NetworkConfigParser()
+    parser.hostname = hostname
+    output_file = os.path.join(output_dir, f"{hostname}.xlsx")
+    if isinstance(lines, str):
+        with open(lines, 'r', encoding='utf-8', newline='') as segment:
+            parser.generate_excel_report(segment, output_file, streaming=streaming)
+    else:
+        parser.generate_excel_report(lines, output_file, streaming=streaming)
+    return output_file
+
+
+def _update_vlan_index(blocks: Dict[str, Union[str, List[str]]], index_path: str) -> None:
+    """Add every device block to the VlanIndex saved at index_path (created if missing)
+    A port indexed again, e.g. from a re-collected capture, keeps only its new VLANs.
+    """
+    index = VlanIndex.load(index_path) if os.path.exists(index_path) else VlanIndex()
+    for hostname, lines in blocks.items():
+        parser = NetworkConfigParser()
+        parser.hostname = hostname
+        if isinstance(lines, str):
+            with open(lines, 'r', encoding='utf-8', newline='') as segment:
+                parser.build_vlan_index(segment, index)
+        else:
+            parser.build_vlan_index(lines, index)
+    index.save(index_path)
+    print(f"[*] VLAN index: {len(index)} VLAN-carrying ports -> {index_path}")
+
+
+def generate_device_reports(log_file: str, output_dir: str = '.', streaming: bool = False,
+                            workers: Optional[int] = None, vlan_index: Optional[str] = None) -> List[str]:
+    """One workbook per hostname found in a (multi-device) session log
+    The log is read once into per-device spool files; device blocks are then
+    parsed from those, in parallel, and written. With vlan_index, the devices'
+    VLAN-carrying ports are also added to that VlanIndex file.
+    """
+    with tempfile.TemporaryDirectory(prefix='dcni_') as spool_dir:
+        with open(log_file, 'r') as file:
+            blocks = split_session_log(file, spool_dir)
+
+        if not blocks:
+            print(f"[Error] No device output found in {log_file}")
+            return []
+
+        written = _write_device_reports(blocks, output_dir, streaming, workers)
+        if vlan_index:
+            _update_vlan_index(blocks, vlan_index)
+        return written
+
+
+def generate_store_reports(store_path: str, devices: Optional[List[str]] = None, output_dir: str = '.',
+                           streaming: bool = False, workers: Optional[int] = None,
+                           vlan_index: Optional[str] = None) -> List[str]:
+    """One workbook per device from the latest captures in a collector capture store
+    Only the three report commands are read back; nothing is searched for.
+    With vlan_index, the devices' VLAN-carrying ports are also added to that VlanIndex file.
+    """
+    with CaptureStore(store_path) as store:
+        devices = devices or store.devices()
+        blocks = {device: list(store.session_lines(device, REPORT_COMMANDS)) for device in devices}
+
+    blocks = {device: lines for device, lines in blocks.items() if len(lines) > 1}
+    if not blocks:
+        print(f"[Error] No captures found in {store_path}")
+        return []
+
+    written = _write_device_reports(blocks, output_dir, streaming, workers)
+    if vlan_index:
+        _update_vlan_index(blocks, vlan_index)
+    return written
+
+
+def _write_device_reports(blocks: Dict[str, Union[str, List[str]]], output_dir: str, streaming: bool,
+                          workers: Optional[int]) -> List[str]:
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Not worth a process pool for the usual single-device log
+    written = []
+    if len(blocks) == 1 or workers == 1:
+        for host, block in blocks.items():
+            try:
+                written.append(_report_device(host, block, output_dir, streaming))
+            except Exception as e:
+                print(f"[Error] {host}: {e}")
+        return written
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(_report_device, host, block, output_dir, streaming): host
+            for host, block in blocks.items()
+        }
+        for future in as_completed(futures):
+            try:
+                written.append(future.result())
+            except Exception as e:
+                print(f"[Error] {futures[future]}: {e}")
+    return written
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Interface/LLDP/config report per device from a session log")
+    parser.add_argument('log', nargs='?', default='session.log', help="Session log (default: session.log)")
+    parser.add_argument('-o', '--output-dir', default='.', help="Directory for the <hostname>.xlsx workbooks")
+    parser.add_argument('-j', '--workers', type=int, default=None, help="Parallel device parsers")
+    parser.add_argument('--store', default=None, help="Read captures from this capture store instead of a log")
+    parser.add_argument('--device', action='append', help="With --store: device to report (repeatable)")
+    # "--stream" keeps memory flat on very large logs
+    parser.add_argument('--stream', action='store_true', help="Write through xlsxwriter constant_memory")
+    parser.add_argument('--vlan-index', default=None,
+                        help="Also add the devices' VLAN-carrying ports to this index (see vlan_index.py query)")
+    return parser.parse_args()
 
-    with open('session.log', 'r') as file:
-        text = file.read()
 
-    parser.generate_excel_report(text)
+def main():
+    args = parse_args()
+    if args.store:
+        generate_store_reports(args.store, args.device, args.output_dir, streaming=args.stream, workers=args.workers,
+                               vlan_index=args.vlan_index)
+    else:
+        generate_device_reports(args.log, args.output_dir, streaming=args.stream, workers=args.workers,
+                                vlan_index=args.vlan_index)
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
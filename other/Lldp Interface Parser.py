@@ -1,35 +1,74 @@
 import re
 import pandas as pd
 
+# Header of 'display interface description'; its column starts give the slice offsets
+DESCRIPTION_HEADER = re.compile(r'^Interface\s+PHY\s+Protocol\s+Description')
+PROMPT = re.compile(r'^<[^<>\s]+>')
+
+
+def parse_interface_description(lines):
+    """
+    Rows of 'display interface description', sliced at the header's column offsets.
+    In the same pass:
+    - a line blank up to the Description column continues the previous row's
+      description (VRP hard-wraps long descriptions at the terminal width)
+    - a line blank up to the PHY column completes an interface whose name
+      was printed on a line of its own
+    - an interface name wider than its column falls back to a whitespace split
+    """
+    rows = []
+    offsets = None
+    for line in lines:
+        line = line.rstrip('\r\n')
+        if offsets is None:
+            if DESCRIPTION_HEADER.match(line):
+                offsets = (line.index('PHY'), line.index('Protocol'), line.index('Description'))
+            continue
+        if PROMPT.match(line):
+            break
+        if not line.strip():
+            continue
+
+        phy_at, protocol_at, description_at = offsets
+        name = line[:phy_at].strip()
+        if not name:
+            phy = line[phy_at:protocol_at].strip()
+            if phy and rows and not rows[-1]['PHY']:
+                rows[-1].update(PHY=phy, Protocol=line[protocol_at:description_at].strip(),
+                                Description=line[description_at:].strip())
+            elif rows:
+                rows[-1]['Description'] += line[description_at:].strip()
+            continue
+
+        if len(line) >= phy_at and line[phy_at - 1] != ' ':
+            fields = line.split(None, 3) + ['', '', '']
+            rows.append({'Interface': fields[0], 'PHY': fields[1], 'Protocol': fields[2],
+                         'Description': fields[3].strip()})
+            continue
+
+        rows.append({
+            'Interface': name,
+            'PHY': line[phy_at:protocol_at].strip(),
+            'Protocol': line[protocol_at:description_at].strip(),
+            'Description': line[description_at:].strip()
+        })
+    return rows
+
+
 # Read the content of the source file
 with open('source.txt', 'r') as file:
     content = file.read()
 
-# Split the content into interface status and LLDP sections
-interface_section = re.search(r'Interface.*?Description(.*?)display lldp', content, re.DOTALL)
-lldp_section = re.search(r'display lldp neighbor brief(.*)', content, re.DOTALL)
-
 # Parse the interface status section
-if interface_section:
-    interface_lines = re.findall(r'^(\S+)\s+(up|down|\*down)\s+(up|down)\s*(.*)$', interface_section.group(1), re.MULTILINE)
-    interface_data = []
-    for line in interface_lines:
-        interface = line[0]
-        phy = line[1]
-        protocol = line[2]
-        description = line[3].strip()
-        interface_data.append({
-            'Interface': interface,
-            'PHY': phy,
-            'Protocol': protocol,
-            'Description': description
-        })
-    interface_df = pd.DataFrame(interface_data)
+interface_data = parse_interface_description(content.splitlines())
+if interface_data:
+    combined_df = pd.DataFrame(interface_data)
 else:
-    interface_df = pd.DataFrame()
+    combined_df = pd.DataFrame()
     print("Interface Status section not found.")
 
 # Parse the LLDP neighbor brief section
+lldp_section = re.search(r'display lldp neighbor brief(.*)', content, re.DOTALL)
 if lldp_section:
     lldp_lines = re.findall(r'^(\S+)\s+\d+\s+(\S+)\s+(\S+)$', lldp_section.group(1), re.MULTILINE)
     lldp_data = []
@@ -44,23 +83,6 @@ else:
     lldp_df = pd.DataFrame()
     print("LLDP Neighbors section not found.")
 
-# Create the combined dataframe based on logic required (merging rows)
-combined_data = []
-i = 0
-while i < len(interface_df):
-    row = interface_df.iloc[i].to_dict()
-    if not row['Description'] and i + 1 < len(interface_df):
-        # Merge with the next row
-        next_row = interface_df.iloc[i + 1].to_dict()
-        row['Description'] = f"{next_row['Interface']} {next_row['PHY']} {next_row['Protocol']}"
-        combined_data.append(row)
-        i += 2  # Skip the next row
-    else:
-        combined_data.append(row)
-        i += 1
-
-combined_df = pd.DataFrame(combined_data)
-
 # Save to Excel with two sheets
 with pd.ExcelWriter('network_report.xlsx', engine='openpyxl') as writer:
     combined_df.to_excel(writer, sheet_name='Interface Status', index=False)
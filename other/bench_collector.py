@@ -0,0 +1,62 @@
+import io
+import os
+import sys
+import time
+import tempfile
+from contextlib import redirect_stdout
+
+from collector import load_inventory, run_collection
+from vrp_sim import DEFAULT_RECORDINGS, VrpSimulator, build_zones, load_recordings, write_inventory
+
+# ==============================================================================
+# Benchmark: end-to-end collection throughput against the simulated VRP CLI
+# (vrp_sim.py), for increasing bastion session counts: a full pull, then two
+# runs with the change probe (the first stores the probe output, the second
+# finds every device unchanged)
+#
+#   python bench_collector.py                -> 200 synthetic switches, latency x0.2
+#   python bench_collector.py 500 0.05
+# ==============================================================================
+
+SYNTHETIC_DEVICES = 200
+LATENCY_SCALE = 0.2
+SESSION_COUNTS = [1, 2, 4, 8, 15]
+BASE_PORT = 23900
+
+
+def bench(n_devices, scale):
+    recordings = load_recordings(DEFAULT_RECORDINGS)
+    zones = build_zones(recordings, synthetic=n_devices)
+    sim = VrpSimulator(zones, scale=scale)
+    ports = sim.start_background(base_port=BASE_PORT)
+    print(f"{n_devices} simulated switches, latency x{scale}, VTY limit {sim.vty_limit}")
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            inventory = os.path.join(tmp, "sim_inventory.json")
+            write_inventory(inventory, zones, ports)
+            selected = load_inventory(inventory)
+
+            for sessions in SESSION_COUNTS:
+                out_dir = os.path.join(tmp, f"run_{sessions}")
+                for label, full in (("full", True), ("probe", False), ("probe", False)):
+                    start = time.perf_counter()
+                    with redirect_stdout(io.StringIO()):
+                        results = run_collection(selected, "sim", out_dir, sessions=sessions, full=full)
+                    elapsed = time.perf_counter() - start
+                    ok = sum(r["ok"] for r in results)
+                    cached = sum(1 for r in results if r.get("cached"))
+                    print(f"  sessions {sessions:>2} {label:<5}: {ok}/{len(results)} devices in {elapsed:7.1f}s  "
+                          f"({ok / elapsed:6.2f} devices/s, {cached} unchanged)")
+    finally:
+        sim.stop()
+
+
+def main():
+    n_devices = int(sys.argv[1]) if len(sys.argv) > 1 else SYNTHETIC_DEVICES
+    scale = float(sys.argv[2]) if len(sys.argv) > 2 else LATENCY_SCALE
+    bench(n_devices, scale)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+import io
+import random
+import sys
+import time
+
+import pandas as pd
+
+from DCNI_Interface_Config import NetworkConfigParser
+
+# ==============================================================================
+# Benchmark: iterrows() enrichment vs. merge-based join in generate_excel_report
+#
+#   python bench_dcni_join.py            -> synthetic 10k-interface session log
+#   python bench_dcni_join.py session.log
+# ==============================================================================
+
+SYNTHETIC_INTERFACES = 10000
+HOSTNAME = "BENCH-CORE-01"
+
+COLUMN_ORDER = [
+    'Hostname', 'Interface Slot', 'Interface Port', 'PHY', 'Protocol', 'Description',
+    'Neighbor Interface Slot', 'Neighbor Interface Port', 'Neighbor Device',
+    'Eth-Trunk', 'Eth-Trunk VLAN', 'VLAN'
+]
+
+
+def legacy_join(parser, interfaces_df, neighbors_df, configs_df):
+    """The original per-row lookup loop, kept as the reference implementation."""
+    interfaces_df = interfaces_df.copy()
+    neighbors_lookup = neighbors_df.set_index('Local Interface').to_dict('index')
+    configs_lookup = configs_df.set_index('Interface').to_dict('index')
+
+    interfaces_df['Hostname'] = parser.hostname
+    interfaces_df['Neighbor Interface Slot'] = ''
+    interfaces_df['Neighbor Interface Port'] = ''
+    interfaces_df['Neighbor Device'] = ''
+    interfaces_df['Eth-Trunk'] = ''
+    interfaces_df['Eth-Trunk VLAN'] = ''
+    interfaces_df['VLAN'] = ''
+
+    for index, row in interfaces_df.iterrows():
+        full_interface = row['Interface']
+
+        neighbor_data = neighbors_lookup.get(full_interface, {})
+        neighbor_interface = neighbor_data.get('Neighbor Interface', '')
+        if neighbor_interface:
+            neighbor_slot, neighbor_port = parser._split_interface(neighbor_interface)
+            interfaces_df.at[index, 'Neighbor Interface Slot'] = neighbor_slot
+            interfaces_df.at[index, 'Neighbor Interface Port'] = neighbor_port
+
+        interfaces_df.at[index, 'Neighbor Device'] = neighbor_data.get('Neighbor Device', '')
+
+        config_data = configs_lookup.get(full_interface, {})
+        interfaces_df.at[index, 'Eth-Trunk'] = config_data.get('Eth-Trunk', '')
+        interfaces_df.at[index, 'VLAN'] = config_data.get('VLAN', '')
+
+        if interfaces_df.at[index, 'Eth-Trunk']:
+            trunk_vlan = configs_lookup.get(interfaces_df.at[index, 'Eth-Trunk'], {}).get('VLAN', '')
+            interfaces_df.at[index, 'Eth-Trunk VLAN'] = trunk_vlan
+
+    return interfaces_df[COLUMN_ORDER]
+
+
+def synthetic_log(n_interfaces, seed=11):
+    """display interface description / lldp neighbor brief / current-configuration for one chassis."""
+    rnd = random.Random(seed)
+    names = [f"10GE{i // 2304 + 1}/{(i // 48) % 48}/{i % 48}" for i in range(n_interfaces)]
+    trunks = [f"Eth-Trunk{t}" for t in range(1, 129)]
+    neighbor_formats = ["100GE1/0/{}", "GigabitEthernet0/5/{}", "{}", "Northbound", "10GE1/4/0/{}"]
+
+    out = [f"<{HOSTNAME}>display interface description",
+           "Interface                     PHY     Protocol Description"]
+    for name in names + trunks:
+        desc = f"To_SRV{rnd.randint(0, 99999):05d}" if rnd.random() < 0.8 else ""
+        out.append(f"{name:<30}{rnd.choice(['up', 'down', '*down']):<8}{rnd.choice(['up', 'down']):<9}{desc}")
+
+    out.append(f"<{HOSTNAME}>display lldp neighbor brief")
+    out.append("Local Interface         Exptime(s) Neighbor Interface            Neighbor Device")
+    out.append("-" * 85)
+    for name in names:
+        if rnd.random() < 0.6:
+            neighbor = rnd.choice(neighbor_formats).format(rnd.randint(0, 55))
+            out.append(f"{name:<30}{rnd.randint(90, 120):>3}  {neighbor:<30}NEIGHBOR{rnd.randint(1, 400):03d}")
+
+    out.append(f"<{HOSTNAME}>display current-configuration interface")
+    out.append("#")
+    for trunk in trunks:
+        out += [f"interface {trunk}", " port link-type trunk",
+                f" port trunk allow-pass vlan 10 to {rnd.randint(20, 4094)}", "#"]
+    for name in names:
+        out.append(f"interface {name}")
+        kind = rnd.random()
+        if kind < 0.2:
+            out.append(f" eth-trunk {rnd.randint(1, 140)}")
+        elif kind < 0.7:
+            out.append(f" port default vlan {rnd.randint(1, 4094)}")
+        out.append("#")
+    out.append(f"<{HOSTNAME}>")
+    return "\n".join(out) + "\n"
+
+
+def main():
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], 'r') as f:
+            text = f.read()
+    else:
+        text = synthetic_log(SYNTHETIC_INTERFACES)
+
+    parser = NetworkConfigParser()
+    interfaces, neighbors, configs = parser.parse_stream(io.StringIO(text))
+    interfaces_df = pd.DataFrame(interfaces)
+    neighbors_df = pd.DataFrame(neighbors)
+    configs_df = pd.DataFrame(configs)
+    print(f"{len(interfaces_df)} interfaces, {len(neighbors_df)} LLDP neighbors, {len(configs_df)} configs")
+
+    start = time.perf_counter()
+    legacy = legacy_join(parser, interfaces_df, neighbors_df, configs_df)
+    t_legacy = time.perf_counter() - start
+
+    start = time.perf_counter()
+    joined = parser._join_interface_data(interfaces_df, neighbors_df, configs_df)[COLUMN_ORDER]
+    t_joined = time.perf_counter() - start
+
+    # Compare the rendered sheet content, cell by cell
+    same = legacy.astype(str).to_csv(index=False) == joined.astype(str).to_csv(index=False)
+    print(f"  iterrows loop : {t_legacy * 1000:8.1f} ms")
+    print(f"  merge pipeline: {t_joined * 1000:8.1f} ms  ({t_legacy / t_joined:.1f}x)  "
+          f"output {'OK' if same else 'MISMATCH'}")
+    sys.exit(0 if same else 1)
+
+
+if __name__ == '__main__':
+    main()
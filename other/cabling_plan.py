@@ -0,0 +1,186 @@
+import os
+import pickle
+import hashlib
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from openpyxl import load_workbook
+
+# ==============================================================================
+# CABLING PLAN READER
+#
+# Reads sheets of a point-to-point cabling plan straight from the source
+# workbook. pandas' openpyxl reader opens it read_only / data_only and streams
+# every row regardless of hidden rows, hidden columns or auto-filters, so there
+# is no need to unhide, save a temp copy and read that back.
+#
+# consolidate() extracts sheets from a whole Wave folder of plans across a
+# process pool, reusing a per-plan cache for files whose mtime/hash is unchanged.
+# ==============================================================================
+
+PORT_MAPPING_SHEET = 'Port mapping (IP)'
+SAN_MAPPING_SHEET = 'Port mapping (SAN Switch)'
+
+
+def clean_columns(df):
+    """Strip header whitespace and fold multi-line headers onto one line"""
+    df.columns = df.columns.astype(str).str.strip().str.replace('\n', ' ')
+    return df
+
+
+def read_plan_sheets(path, sheets):
+    """{sheet: DataFrame} for the requested sheets present in the plan, one workbook open"""
+    with pd.ExcelFile(path, engine='openpyxl') as xls:
+        return {sheet: pd.read_excel(xls, sheet_name=sheet) for sheet in sheets if sheet in xls.sheet_names}
+
+
+def read_plan_sheet(path, sheet=PORT_MAPPING_SHEET):
+    """One sheet of a cabling plan as a DataFrame with cleaned column names"""
+    return clean_columns(pd.read_excel(path, sheet_name=sheet, engine='openpyxl'))
+
+
+def deduplicate_columns(columns):
+    """Suffix repeated header names with their position: ['Port', 'Port'] -> ['Port', 'Port_1']"""
+    seen = set()
+    for i, col in enumerate(columns):
+        if col in seen:
+            columns[i] = f"{col}_{i}"
+        seen.add(columns[i])
+    return columns
+
+
+def read_plan_values(path, sheets):
+    """
+    {sheet: DataFrame} of the cells as stored (formulas as text, no type
+    inference), header row deduplicated; one read_only workbook open.
+    """
+    wb = load_workbook(path, read_only=True)
+    try:
+        frames = {}
+        for sheet in sheets:
+            if sheet not in wb.sheetnames:
+                continue
+            data = wb[sheet].values
+            columns = deduplicate_columns(list(next(data, [])))
+            frames[sheet] = pd.DataFrame(data, columns=columns)
+        return frames
+    finally:
+        wb.close()
+
+
+# ==============================================================================
+# CONSOLIDATION ENGINE
+# ==============================================================================
+
+CACHE_SUFFIX = ".sheets.pkl"
+HASH_CHUNK = 1 << 20
+
+
+def file_digest(path):
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def _cache_path(cache_dir, path, reader):
+    # Same basename in two folders, or two readers, never share an entry
+    key = hashlib.sha1(f"{os.path.abspath(path)}|{reader.__name__}".encode("utf-8")).hexdigest()[:12]
+    return os.path.join(cache_dir, f"{os.path.basename(path)}.{key}{CACHE_SUFFIX}")
+
+
+def _load_cached(cache_path, path, sheets):
+    """Cached {sheet: DataFrame} if the plan is unchanged, else None.
+    size + mtime decide first; a changed mtime with identical content
+    (copied / re-synced file) is confirmed by hash and re-stamped."""
+    try:
+        with open(cache_path, "rb") as f:
+            cached = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    if cached.get("sheets") != list(sheets):
+        return None
+
+    stat = os.stat(path)
+    if (cached["size"], cached["mtime_ns"]) == (stat.st_size, stat.st_mtime_ns):
+        return cached["frames"]
+    if cached["size"] != stat.st_size or cached["sha256"] != file_digest(path):
+        return None
+
+    cached["mtime_ns"] = stat.st_mtime_ns
+    _write_cache(cache_path, cached)
+    return cached["frames"]
+
+
+def _write_cache(cache_path, entry):
+    tmp_path = cache_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, cache_path)
+
+
+def extract_plan(path, sheets, reader=read_plan_sheets, cache_dir=None):
+    """Process pool task: read one plan, refresh its cache entry. Returns {sheet: DataFrame}"""
+    stat = os.stat(path)
+    frames = reader(path, sheets)
+    if cache_dir:
+        _write_cache(_cache_path(cache_dir, path, reader), {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": file_digest(path),
+            "sheets": list(sheets),
+            "frames": frames,
+        })
+    return frames
+
+
+def consolidate(files, sheets, reader=read_plan_sheets, workers=None, cache_dir=None):
+    """
+    Extract `sheets` from every plan in `files`.
+    - reader: read_plan_sheets (evaluated values) or read_plan_values (cells as stored)
+    - workers: process pool size for the plans not in the cache (default: os.cpu_count())
+    - cache_dir: per-plan cache of extracted sheets; unchanged plans are not reopened
+    Returns [(path, {sheet: DataFrame}), ...] in the order of `files`; plans that
+    could not be read are reported and left out.
+    """
+    results = {}
+    pending = []
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+        for path in files:
+            frames = _load_cached(_cache_path(cache_dir, path, reader), path, sheets)
+            if frames is None:
+                pending.append(path)
+            else:
+                results[path] = frames
+    else:
+        pending = list(files)
+
+    print(f"[*] {len(files)} plans: {len(files) - len(pending)} cached, {len(pending)} to read")
+
+    if len(pending) <= 1 or workers == 1:
+        for path in pending:
+            try:
+                results[path] = extract_plan(path, sheets, reader, cache_dir)
+            except Exception as e:
+                print(f"[Warn] Skipping {os.path.basename(path)}: {e}")
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(extract_plan, path, sheets, reader, cache_dir): path for path in pending}
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    results[path] = future.result()
+                except Exception as e:
+                    print(f"[Warn] Skipping {os.path.basename(path)}: {e}")
+
+    return [(path, results[path]) for path in files if path in results]
+
+
+def concat_sheets(frames, sheets):
+    """One concat per sheet over [{sheet: DataFrame}, ...]; empty / missing sheets skipped"""
+    combined = {}
+    for sheet in sheets:
+        parts = [f[sheet] for f in frames if sheet in f and not f[sheet].empty]
+        combined[sheet] = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
+    return combined
@@ -0,0 +1,192 @@
+import re
+import sys
+import time
+import zlib
+import sqlite3
+import argparse
+import threading
+
+# ==============================================================================
+# CAPTURE STORE
+#
+# One SQLite row per (device, command, captured_at) with the output stored
+# zlib-compressed, so parsers fetch exactly the command they need by key
+# instead of regex-searching concatenated session logs.
+#
+#   python capture_store.py import captures/captures.db source.txt session.log
+#   python capture_store.py list captures/captures.db
+#   python capture_store.py show captures/captures.db ANPNHQSBTZ01C02 "display lldp neighbor brief"
+# ==============================================================================
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS captures (
+    device      TEXT NOT NULL,
+    command     TEXT NOT NULL,
+    captured_at REAL NOT NULL,
+    zone        TEXT,
+    prompt      TEXT,
+    output      BLOB NOT NULL,
+    PRIMARY KEY (device, command, captured_at)
+)
+"""
+
+COMPRESS_LEVEL = 6
+PROMPT_COMMAND = re.compile(r'^<([^<>\s]+)>(.*)$')
+
+
+def parse_session_log(path):
+    """Yield (device, command, output) for every <HOST>command in a session log"""
+    device = command = None
+    output = []
+
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            match = PROMPT_COMMAND.match(line.rstrip("\n"))
+            if match:
+                if device and command:
+                    yield device, command, "".join(output)
+                device, command = match.group(1), match.group(2).strip() or None
+                output = []
+            else:
+                output.append(line)
+
+    if device and command:
+        yield device, command, "".join(output)
+
+
+class CaptureStore:
+    """
+    with CaptureStore("captures.db") as store:
+        store.add("ANPNHQSBTZ01C02", "display lldp neighbor brief", output)
+        text = store.latest("ANPNHQSBTZ01C02", "display lldp neighbor brief")
+    Safe to share between the collector's session threads.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(SCHEMA)
+        self.conn.commit()
+        self.lock = threading.Lock()
+
+    def add(self, device, command, output, captured_at=None, prompt=None, zone=None):
+        self.add_many([(device, command, output, captured_at, prompt, zone)])
+
+    def add_many(self, records):
+        """records: iterable of (device, command, output, captured_at, prompt, zone)"""
+        now = time.time()
+        rows = [
+            (device, command, captured_at or now, zone, prompt or f"<{device}>",
+             zlib.compress(output.encode("utf-8"), COMPRESS_LEVEL))
+            for device, command, output, captured_at, prompt, zone in records
+        ]
+        with self.lock:
+            self.conn.executemany("INSERT OR REPLACE INTO captures VALUES (?, ?, ?, ?, ?, ?)", rows)
+            self.conn.commit()
+
+    def latest(self, device, command):
+        """Most recent output of command on device, or None"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT output FROM captures WHERE device = ? AND command = ? "
+                "ORDER BY captured_at DESC LIMIT 1", (device, command)
+            ).fetchone()
+        return zlib.decompress(row[0]).decode("utf-8") if row else None
+
+    def history(self, device, command):
+        """[(captured_at, output), ...] oldest first"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT captured_at, output FROM captures WHERE device = ? AND command = ? "
+                "ORDER BY captured_at", (device, command)
+            ).fetchall()
+        return [(ts, zlib.decompress(blob).decode("utf-8")) for ts, blob in rows]
+
+    def devices(self, zone=None):
+        query = "SELECT DISTINCT device FROM captures"
+        params = ()
+        if zone:
+            query += " WHERE zone = ?"
+            params = (zone,)
+        with self.lock:
+            return [row[0] for row in self.conn.execute(query + " ORDER BY device", params)]
+
+    def summary(self):
+        """[(device, command, captures, last captured_at, compressed bytes)]"""
+        with self.lock:
+            return self.conn.execute(
+                "SELECT device, command, COUNT(*), MAX(captured_at), SUM(LENGTH(output)) "
+                "FROM captures GROUP BY device, command ORDER BY device, command"
+            ).fetchall()
+
+    def session_lines(self, device, commands):
+        """
+        Latest output of each command, laid out like a session log
+        (<device>command, output lines, closing prompt) for the log parsers.
+        """
+        for command in commands:
+            output = self.latest(device, command)
+            if output is None:
+                continue
+            yield f"<{device}>{command}\n"
+            yield from output.splitlines(keepends=True)
+            if not output.endswith("\n"):
+                yield "\n"
+        yield f"<{device}>\n"
+
+    def import_session_log(self, path, zone=None):
+        """Split a source.txt / session.log style capture into per-command records"""
+        captured_at = time.time()
+        records = [(device, command, output, captured_at, f"<{device}>", zone)
+                   for device, command, output in parse_session_log(path)]
+        self.add_many(records)
+        return len(records)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-command capture store for collector output")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_import = sub.add_parser("import", help="Load session logs / source.txt captures")
+    p_import.add_argument("store")
+    p_import.add_argument("logs", nargs="+")
+    p_import.add_argument("--zone", default=None)
+
+    p_list = sub.add_parser("list", help="Devices and commands in the store")
+    p_list.add_argument("store")
+
+    p_show = sub.add_parser("show", help="Print the latest output of one command")
+    p_show.add_argument("store")
+    p_show.add_argument("device")
+    p_show.add_argument("cli", help='e.g. "display lldp neighbor brief"')
+
+    args = parser.parse_args()
+
+    with CaptureStore(args.store) as store:
+        if args.command == "import":
+            for log in args.logs:
+                print(f"[*] {log}: {store.import_session_log(log, args.zone)} command outputs")
+        elif args.command == "list":
+            for device, command, count, last, size in store.summary():
+                stamp = time.strftime("%Y-%m-%d %H:%M", time.localtime(last))
+                print(f"{device}\t{command}\t{count}\t{stamp}\t{size}")
+        else:
+            output = store.latest(args.device, args.cli)
+            if output is None:
+                print(f"[Error] No capture of '{args.cli}' for {args.device}")
+                sys.exit(1)
+            sys.stdout.write(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,490 @@
+import os
+import re
+import sys
+import json
+import time
+import queue
+import getpass
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from netmiko import ConnectHandler
+from netmiko.exceptions import ReadTimeout
+
+from capture_store import CaptureStore
+
+# ==============================================================================
+# INVENTORY-DRIVEN COLLECTOR
+#
+# Replaces the one-target-per-run AN_*.py / MCN_*.py scripts: every zone in
+# inventory.json is collected in one run, each bastion driven by a small pool
+# of sessions that hop to targets one after another.
+#
+#   python collector.py                          -> every zone in inventory.json
+#   python collector.py -z AN_DZ -z MCN_SZ       -> selected zones
+#   python collector.py -z AN_TZ -t ANPNHQSBTZ01C02 --sessions 2
+#
+# Password: $COLLECTOR_PASSWORD, otherwise prompted once.
+# Every command output is also recorded in <output_dir>/captures.db
+# (see capture_store.py), keyed by device, command and time.
+# Read timeouts adapt per (role, command) from <output_dir>/latency.json.
+# ==============================================================================
+
+DEFAULT_INVENTORY = "inventory.json"
+DEFAULT_OUTPUT_DIR = "captures"
+DEFAULT_SESSIONS = 4
+STORE_NAME = "captures.db"
+LATENCY_NAME = "latency.json"
+
+# Same per-target commands the AN_*/MCN_* scripts run after the hop
+COMMANDS = [
+    'screen-length 0 temporary',
+    'display interface description',
+    'display lldp neighbor brief',
+    'display current-configuration interface'
+]
+
+# Cheap probe run before the config pull; when its output matches the one stored
+# with the last full capture, CONFIG_COMMANDS are served from the capture store.
+# Interface status and LLDP are operational state and always run live.
+DEFAULT_PROBE = 'display configuration commit list 1'
+CONFIG_COMMANDS = {'display current-configuration interface'}
+
+
+def load_inventory(path, zones=None, names=None):
+    """
+    Returns [zone, ...], each zone a dict:
+      {"zone", "bastion", "sessions", "device_type", "username", "port", "probe",
+       "targets": [{"name", "host", "role"}]}
+    "probe": null in the inventory turns change detection off for that zone.
+    zones / names restrict the result to the given zone and target names.
+    Hosts are stripped: IPs copied out of the scripts can carry trailing spaces.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    defaults = data.get("defaults", {})
+    selected = []
+    for zone_name, zone in data["zones"].items():
+        if zones and zone_name not in zones:
+            continue
+        targets = [dict(t, host=t["host"].strip()) for t in zone["targets"] if not names or t["name"] in names]
+        if not targets:
+            continue
+        selected.append({
+            "zone": zone_name,
+            "bastion": zone["bastion"].strip(),
+            "sessions": zone.get("sessions", defaults.get("sessions", DEFAULT_SESSIONS)),
+            "device_type": zone.get("device_type", defaults.get("device_type", "huawei")),
+            "username": zone.get("username", defaults.get("username")),
+            "port": zone.get("port", defaults.get("port")),
+            "probe": zone.get("probe", defaults.get("probe", DEFAULT_PROBE)),
+            "targets": targets,
+        })
+    return selected
+
+
+# --- stelnet hop: expect-style login instead of fixed sleeps ---
+# (state, pattern) in the order VRP normally shows them; the first match wins
+POLL_INTERVAL = 0.05
+DEVICE_PROMPT = re.compile(r"<[^<>\s]+>\s*$")
+LOGIN_PATTERNS = [
+    ("warning", re.compile(r"Continue to access it\? \[Y/N\]:")),
+    ("public_key", re.compile(r"Save the server's public key\? \[Y/N\]:")),
+    ("username", re.compile(r"Please input the username:")),
+    ("password", re.compile(r"Enter password:")),
+    ("error", re.compile(r"Error: .*|Connection refused|Connection timed out")),
+    ("prompt", DEVICE_PROMPT),
+]
+# Seconds to wait for the next pattern, keyed by the step just completed
+LOGIN_TIMEOUTS = {"connect": 20, "warning": 10, "public_key": 10, "username": 10, "password": 20}
+
+
+def expect(conn, patterns, timeout):
+    """
+    Read the channel until one of patterns matches, polling every POLL_INTERVAL.
+    Returns (index, match, text); index is None on timeout.
+    """
+    text = ""
+    deadline = time.monotonic() + timeout
+    while True:
+        text += conn.read_channel()
+        for i, pattern in enumerate(patterns):
+            match = pattern.search(text)
+            if match:
+                return i, match, text
+        if time.monotonic() >= deadline:
+            return None, None, text
+        time.sleep(POLL_INTERVAL)
+
+
+def stelnet_login(conn, target_ip, username, password, bastion_prompt=None):
+    """
+    Drive the stelnet dialog as a state machine: answer each prompt as soon
+    as it appears. Returns (remote_prompt, timings) where timings maps each
+    step to the seconds spent waiting for it, plus "total". Raises on
+    timeout, an Error: line or a rejected login.
+    """
+    responses = {"warning": "Y", "public_key": "N", "username": username, "password": password}
+    patterns = [pattern for _, pattern in LOGIN_PATTERNS]
+    timings = {}
+    answered = set()
+    step = "connect"
+    start = last = time.perf_counter()
+
+    conn.write_channel(f"stelnet {target_ip}\n")
+    while True:
+        index, match, text = expect(conn, patterns, LOGIN_TIMEOUTS[step])
+        now = time.perf_counter()
+        if index is None:
+            raise TimeoutError(f"no response after '{step}' within {LOGIN_TIMEOUTS[step]}s")
+
+        state = LOGIN_PATTERNS[index][0]
+        timings[state] = round(now - last, 2)
+        last = now
+
+        if state == "error":
+            raise ConnectionError(match.group(0).strip())
+        if state == "prompt":
+            remote_prompt = match.group(0).strip()
+            if remote_prompt == bastion_prompt:
+                raise ConnectionError("stelnet returned to the bastion prompt")
+            timings["total"] = round(now - start, 2)
+            return remote_prompt, timings
+        if state in answered:
+            # VRP asks for the username again after a failed login
+            raise ConnectionError(f"login rejected (second '{state}' prompt)")
+
+        answered.add(state)
+        conn.write_channel(f"{responses[state]}\n")
+        step = state
+
+
+def handle_stelnet(conn, target_ip, username, password, timings=None):
+    """Handle Huawei stelnet with proper prompt sequence"""
+    bastion_prompt = conn.find_prompt()
+
+    try:
+        remote_prompt, steps = stelnet_login(conn, target_ip, username, password, bastion_prompt)
+        if timings is not None:
+            timings.update(steps)
+        detail = ", ".join(f"{k} {v:.1f}s" for k, v in steps.items() if k != "total")
+        print(f"[*] stelnet {target_ip}: {remote_prompt} in {steps['total']:.1f}s ({detail})")
+        return remote_prompt
+
+    except Exception as e:
+        print(f"Stelnet Error: {str(e)}")
+        # Abort a half-finished dialog; a failed hop leaves us on the bastion
+        conn.write_channel("\x03")
+        expect(conn, [re.compile(re.escape(bastion_prompt) + r"\s*$")], 5)
+        return None
+
+
+def leave_target(conn, bastion_prompt):
+    """quit back to the bastion; False if the session is no longer usable"""
+    conn.write_channel("quit\n")
+    index, _, _ = expect(conn, [re.compile(re.escape(bastion_prompt) + r"\s*$")], 10)
+    return index is not None
+
+
+# --- adaptive read timeouts ---
+FIXED_READ_TIMEOUT = 120      # worst case for a full config pull on a large switch
+MIN_SAMPLES = 3               # below this, keep FIXED_READ_TIMEOUT
+MAX_SAMPLES = 20              # rolling window per (role, command)
+TIMEOUT_HEADROOM = 2.0        # read_timeout = slowest recent run x headroom
+MIN_READ_TIMEOUT = 10
+
+
+class LatencyStats:
+    """
+    Observed command latency per (device class, command), persisted as JSON.
+    Keys with enough samples get a read_timeout learned from them instead of
+    FIXED_READ_TIMEOUT, so a hung command fails in seconds rather than minutes.
+    Per run, the measured command time is kept for learned and fixed timeouts.
+    """
+
+    def __init__(self, path=None, adaptive=True):
+        self.path = path
+        self.adaptive = adaptive
+        self.stats = {}
+        self.lock = threading.Lock()
+        # {"learned" / "fixed": [commands, seconds]} measured this run
+        self.measured = {"learned": [0, 0.0], "fixed": [0, 0.0]}
+        self.retries = 0
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.stats = json.load(f)
+
+    @staticmethod
+    def key(device_class, command):
+        return f"{device_class or 'default'}|{command}"
+
+    def read_timeout(self, device_class, command):
+        """Learned seconds for send_command(read_timeout=...), or None to keep FIXED_READ_TIMEOUT"""
+        if not self.adaptive:
+            return None
+        with self.lock:
+            entry = self.stats.get(self.key(device_class, command))
+            if not entry or len(entry["samples"]) < MIN_SAMPLES:
+                return None
+            return max(MIN_READ_TIMEOUT, round(max(entry["samples"]) * TIMEOUT_HEADROOM, 1))
+
+    def record(self, device_class, command, seconds, learned):
+        with self.lock:
+            entry = self.stats.setdefault(self.key(device_class, command), {"samples": []})
+            entry["samples"] = (entry["samples"] + [round(seconds, 3)])[-MAX_SAMPLES:]
+            measured = self.measured["learned" if learned else "fixed"]
+            measured[0] += 1
+            measured[1] += seconds
+
+    def save(self):
+        if not self.path:
+            return
+        tmp_path = self.path + ".tmp"
+        with self.lock, open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.stats, f, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+def run_command(conn, command, prompt, device_class=None, latency=None):
+    """
+    send_command waiting for the known prompt (no per-call find_prompt), with a
+    learned read_timeout when one is known; returns the output
+    """
+    expect_string = re.escape(prompt)
+    timeout = latency.read_timeout(device_class, command) if latency else None
+    start = time.perf_counter()
+
+    if timeout is None:
+        output = conn.send_command(command, expect_string=expect_string, read_timeout=FIXED_READ_TIMEOUT)
+    else:
+        try:
+            output = conn.send_command(command, expect_string=expect_string, read_timeout=timeout)
+        except ReadTimeout:
+            # Slower than anything seen so far: drain the channel and redo it with the fixed timeout
+            print(f"[Warn] '{command}' exceeded {timeout}s, retrying with read_timeout={FIXED_READ_TIMEOUT}")
+            with latency.lock:
+                latency.retries += 1
+            conn.read_until_pattern(pattern=expect_string, read_timeout=FIXED_READ_TIMEOUT)
+            output = conn.send_command(command, expect_string=expect_string, read_timeout=FIXED_READ_TIMEOUT)
+            timeout = None
+
+    if latency:
+        latency.record(device_class, command, time.perf_counter() - start, learned=timeout is not None)
+    return output
+
+
+def probe_unchanged(conn, store, name, probe, prompt, device_class=None, latency=None):
+    """
+    Run the change probe; returns (unchanged, probe_output). Unchanged only
+    when the output is usable and identical to the last stored probe.
+    """
+    output = run_command(conn, probe, prompt, device_class, latency)
+    if not output.strip() or "Error:" in output:
+        return False, output
+    return output == store.latest(name, probe), output
+
+
+def collect_target(conn, bastion_prompt, target, username, password, output_dir, store=None, zone=None,
+                   latency=None, probe=None):
+    """
+    Hop to one target, run COMMANDS and write <output_dir>/<name>.txt in the
+    source.txt layout (prompt + command, then output); with a store, each
+    output is also recorded as its own capture.
+    With a probe command and a store, CONFIG_COMMANDS are reused from the
+    store when the probe output has not changed since the last capture.
+    Returns (result dict, session_ok).
+    """
+    result = {"name": target["name"], "host": target["host"], "ok": False, "path": None, "error": "",
+              "login": {}, "cached": 0}
+    start = time.perf_counter()
+
+    remote_prompt = handle_stelnet(conn, target["host"], username, password, result["login"])
+    if not remote_prompt or remote_prompt == bastion_prompt:
+        result["error"] = "stelnet failed"
+        return result, conn.find_prompt() == bastion_prompt
+
+    path = os.path.join(output_dir, f"{target['name']}.txt")
+    captures = []
+    try:
+        unchanged = False
+        if probe and store is not None:
+            unchanged, probe_output = probe_unchanged(conn, store, target["name"], probe, remote_prompt,
+                                                      target.get("role"), latency)
+            captures.append((target["name"], probe, probe_output, time.time(), remote_prompt, zone))
+
+        with open(path, "w", encoding="utf-8") as f:
+            for cmd in COMMANDS:
+                cached = store.latest(target["name"], cmd) if unchanged and cmd in CONFIG_COMMANDS else None
+                if cached is not None:
+                    output = cached
+                    result["cached"] += 1
+                else:
+                    output = run_command(conn, cmd, remote_prompt, target.get("role"), latency)
+                    captures.append((target["name"], cmd, output, time.time(), remote_prompt, zone))
+                f.write(f"{remote_prompt}{cmd}\n{output}\n")
+        if store is not None:
+            store.add_many(captures)
+        result.update(ok=True, path=path)
+    except Exception as e:
+        result["error"] = str(e)
+
+    result["seconds"] = round(time.perf_counter() - start, 1)
+    return result, leave_target(conn, bastion_prompt)
+
+
+def open_bastion(zone, password):
+    """Log in to the zone's bastion; returns (conn, bastion_prompt)"""
+    device = {
+        'device_type': zone["device_type"],
+        'host': zone["bastion"],
+        'username': zone["username"],
+        'password': password,
+    }
+    if zone.get("port"):
+        device['port'] = zone["port"]
+
+    conn = ConnectHandler(**device)
+    conn.enable()
+    # Found once; every later command waits for it instead of re-probing
+    prompt = conn.find_prompt()
+    conn.send_command("screen-length 0 temporary", expect_string=re.escape(prompt))
+    return conn, prompt
+
+
+def _bastion_session(zone, jobs, password, output_dir, results, lock, store=None, latency=None, full=False):
+    """
+    One authenticated bastion session working through the zone's job queue.
+    Login and channel errors are raised to run_collection; a target in
+    progress when the channel fails is recorded as failed first.
+    """
+    conn, bastion_prompt = open_bastion(zone, password)
+
+    with conn:
+        while True:
+            try:
+                target = jobs.get_nowait()
+            except queue.Empty:
+                break
+
+            try:
+                result, session_ok = collect_target(conn, bastion_prompt, target, zone["username"],
+                                                    password, output_dir, store, zone["zone"], latency,
+                                                    None if full else zone["probe"])
+            except Exception as e:
+                with lock:
+                    results.append({"zone": zone["zone"], "name": target["name"], "host": target["host"],
+                                    "ok": False, "path": None, "error": f"session lost: {e}"})
+                raise
+            result["zone"] = zone["zone"]
+            with lock:
+                results.append(result)
+            if result["ok"]:
+                print(f"[*] {zone['zone']}/{target['name']}: {len(COMMANDS)} commands -> {result['path']}")
+            else:
+                print(f"[Error] {zone['zone']}/{target['name']}: {result['error']}")
+
+            if not session_ok:
+                # Stuck on the target (or lost the channel): leave the rest to the other sessions
+                print(f"[Warn] {zone['zone']}: session did not return to {bastion_prompt}, closing it")
+                break
+
+
+def run_collection(zones, password, output_dir=DEFAULT_OUTPUT_DIR, sessions=None, adaptive=True, full=False):
+    """
+    Collect every target of every zone concurrently.
+    Each zone gets min(sessions, len(targets)) bastion sessions sharing one queue,
+    so concurrency per bastion never exceeds its session limit.
+    adaptive=False keeps FIXED_READ_TIMEOUT for every command (timings are still recorded).
+    full=True skips the change probe and pulls every config.
+    """
+    results = []
+    lock = threading.Lock()
+    workers = []
+
+    os.makedirs(output_dir, exist_ok=True)
+    store = CaptureStore(os.path.join(output_dir, STORE_NAME))
+    latency = LatencyStats(os.path.join(output_dir, LATENCY_NAME), adaptive)
+
+    for zone in zones:
+        zone_dir = os.path.join(output_dir, zone["zone"])
+        os.makedirs(zone_dir, exist_ok=True)
+
+        jobs = queue.Queue()
+        for target in zone["targets"]:
+            jobs.put(target)
+
+        n_sessions = min(sessions or zone["sessions"], len(zone["targets"]))
+        workers += [(zone, jobs, zone_dir)] * n_sessions
+
+    start = time.perf_counter()
+    session_errors = {}
+    with store, ThreadPoolExecutor(max_workers=max(len(workers), 1)) as pool:
+        futures = {pool.submit(_bastion_session, zone, jobs, password, zone_dir, results, lock, store, latency,
+                               full): zone
+                   for zone, jobs, zone_dir in workers}
+        for future in as_completed(futures):
+            zone = futures[future]
+            error = future.exception()
+            if error is not None:
+                print(f"[Error] {zone['zone']}: bastion {zone['bastion']} session failed: {error}")
+                session_errors[zone["zone"]] = str(error)
+    latency.save()
+
+    # Targets left in a queue had no working bastion session
+    collected = {(r["zone"], r["name"]) for r in results}
+    for zone in zones:
+        error = "no bastion session"
+        if zone["zone"] in session_errors:
+            error += f" ({session_errors[zone['zone']]})"
+        for target in zone["targets"]:
+            if (zone["zone"], target["name"]) not in collected:
+                results.append({"zone": zone["zone"], "name": target["name"], "host": target["host"],
+                                "ok": False, "path": None, "error": error})
+
+    ok = sum(r["ok"] for r in results)
+    print(f"[*] Collected {ok}/{len(results)} devices in {time.perf_counter() - start:.0f}s -> {output_dir}")
+    logins = [r["login"]["total"] for r in results if "total" in r.get("login", {})]
+    if logins:
+        print(f"[*] stelnet login: mean {sum(logins) / len(logins):.1f}s, max {max(logins):.1f}s per hop")
+    cached = sum(1 for r in results if r.get("cached"))
+    if cached:
+        print(f"[*] change probe: {cached} unchanged devices, config served from {STORE_NAME}")
+    for budget, (commands, seconds) in latency.measured.items():
+        if commands:
+            print(f"[*] {budget} read timeouts: {commands} commands, {seconds:.0f}s measured "
+                  f"({seconds / commands:.2f}s per command)")
+    if latency.retries:
+        print(f"[Warn] {latency.retries} commands exceeded their learned read timeout and were re-run")
+    return results
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Collect Huawei switch output through the zone bastions")
+    parser.add_argument("-i", "--inventory", default=DEFAULT_INVENTORY, help="Inventory JSON (zones, bastions, targets)")
+    parser.add_argument("-z", "--zone", action="append", help="Zone to collect (repeatable, default: all)")
+    parser.add_argument("-t", "--target", action="append", help="Target name to collect (repeatable, default: all)")
+    parser.add_argument("-o", "--output-dir", default=DEFAULT_OUTPUT_DIR, help="Per-device output root")
+    parser.add_argument("--sessions", type=int, default=None, help="Bastion sessions per zone (overrides inventory)")
+    parser.add_argument("--fixed-timeout", action="store_true",
+                        help=f"Always use read_timeout={FIXED_READ_TIMEOUT} (still records timings)")
+    parser.add_argument("--full", action="store_true", help="Skip the change probe, pull every config")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    zones = load_inventory(args.inventory, args.zone, args.target)
+    if not zones:
+        print("[Error] No inventory targets matched.")
+        sys.exit(1)
+
+    password = os.environ.get("COLLECTOR_PASSWORD") or getpass.getpass("Password: ")
+    results = run_collection(zones, password, args.output_dir, args.sessions, adaptive=not args.fixed_timeout,
+                             full=args.full)
+    sys.exit(0 if all(r["ok"] for r in results) else 1)
+
+
+if __name__ == "__main__":
+    main()
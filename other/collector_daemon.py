@@ -0,0 +1,377 @@
+import os
+import re
+import sys
+import json
+import hmac
+import stat
+import time
+import socket
+import secrets
+import getpass
+import argparse
+import threading
+import socketserver
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from capture_store import CaptureStore
+from collector import (
+    DEFAULT_INVENTORY,
+    DEFAULT_OUTPUT_DIR,
+    LATENCY_NAME,
+    STORE_NAME,
+    LatencyStats,
+    collect_target,
+    expect,
+    load_inventory,
+    open_bastion,
+)
+
+# ==============================================================================
+# COLLECTOR DAEMON
+#
+# Keeps authenticated bastion sessions warm between collection jobs, so
+# repeated audits during a change window skip the SSH handshake, bastion login
+# and screen-length setup. Jobs arrive as JSON lines on a localhost socket.
+#
+#   python collector_daemon.py serve                      (password: $COLLECTOR_PASSWORD or prompt)
+#   python collector_daemon.py collect -z AN_TZ -t ANPNHQSBTZ01C02
+#   python collector_daemon.py status
+#   python collector_daemon.py stop
+#
+# Requests must carry the shared token from --token-file (created with 0600
+# permissions by 'serve' on first start), since a job logs in to production
+# bastions.
+#
+# Zones may set "port" / "device_type" in inventory.json to point the daemon at
+# a local simulated CLI instead of a real bastion.
+# ==============================================================================
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+KEEPALIVE_INTERVAL = 60       # seconds an idle session may sit before it is poked
+DEFAULT_TOKEN_FILE = os.path.join(os.path.expanduser("~"), ".collector_daemon.token")
+
+
+def load_token(path, create=False):
+    """
+    Shared secret from path; create=True writes a new one (0600) if it is missing.
+    Raises PermissionError if group/others can read the file (POSIX only).
+    """
+    if create and not os.path.exists(path):
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(secrets.token_hex(32) + "\n")
+    if os.name == "posix" and stat.S_IMODE(os.stat(path).st_mode) & 0o077:
+        raise PermissionError(f"{path} must not be readable by group/others (chmod 600)")
+    with open(path, "r", encoding="utf-8") as f:
+        token = f.read().strip()
+    if not token:
+        raise ValueError(f"{path} is empty")
+    return token
+
+
+class BastionPool:
+    """
+    Warm bastion sessions per zone, never more than zone["sessions"] open.
+    A session is {"conn", "prompt", "last_used"}; acquire() hands out an idle
+    one or logs in a new one, release() returns it (or drops it if unhealthy).
+    """
+
+    def __init__(self, password):
+        self.password = password
+        self.cond = threading.Condition()
+        self.idle = {}
+        self.open = {}
+        self.logins = 0
+        self.reused = 0
+
+    def acquire(self, zone):
+        name = zone["zone"]
+        with self.cond:
+            while True:
+                idle = self.idle.setdefault(name, [])
+                if idle:
+                    self.reused += 1
+                    return idle.pop()
+                if self.open.get(name, 0) < zone["sessions"]:
+                    self.open[name] = self.open.get(name, 0) + 1
+                    break
+                self.cond.wait()
+
+        try:
+            conn, prompt = open_bastion(zone, self.password)
+        except Exception:
+            with self.cond:
+                self.open[name] -= 1
+                self.cond.notify_all()
+            raise
+
+        with self.cond:
+            self.logins += 1
+        return {"conn": conn, "prompt": prompt, "last_used": time.monotonic()}
+
+    def release(self, zone, session, healthy=True):
+        name = zone["zone"]
+        if not healthy:
+            self._close(session)
+        with self.cond:
+            if healthy:
+                session["last_used"] = time.monotonic()
+                self.idle.setdefault(name, []).append(session)
+            else:
+                self.open[name] -= 1
+            self.cond.notify_all()
+
+    def keepalive(self):
+        """Poke sessions idle for KEEPALIVE_INTERVAL so the bastion VTY timeout never fires"""
+        now = time.monotonic()
+        with self.cond:
+            stale = [(name, s) for name, sessions in self.idle.items() for s in sessions
+                     if now - s["last_used"] >= KEEPALIVE_INTERVAL]
+            for name, session in stale:
+                self.idle[name].remove(session)
+
+        for name, session in stale:
+            try:
+                session["conn"].write_channel("\n")
+                prompt = re.compile(re.escape(session["prompt"]) + r"\s*$")
+                healthy = expect(session["conn"], [prompt], 5)[0] is not None
+            except Exception:
+                healthy = False
+            self.release({"zone": name}, session, healthy)
+            if not healthy:
+                print(f"[Warn] {name}: dropped a dead bastion session")
+
+    def status(self):
+        with self.cond:
+            return {
+                "zones": {name: {"open": self.open.get(name, 0), "idle": len(self.idle.get(name, []))}
+                          for name in set(self.open) | set(self.idle)},
+                "logins": self.logins,
+                "reused": self.reused,
+            }
+
+    def close_all(self):
+        with self.cond:
+            sessions = [s for idle in self.idle.values() for s in idle]
+            self.idle.clear()
+            self.open.clear()
+        for session in sessions:
+            self._close(session)
+
+    @staticmethod
+    def _close(session):
+        try:
+            session["conn"].disconnect()
+        except Exception:
+            pass
+
+
+class CollectorDaemon:
+    def __init__(self, inventory, password, output_dir=DEFAULT_OUTPUT_DIR):
+        self.inventory = inventory
+        self.output_dir = output_dir
+        self.pool = BastionPool(password)
+        self.password = password
+        self.jobs = 0
+
+        os.makedirs(output_dir, exist_ok=True)
+        self.store = CaptureStore(os.path.join(output_dir, STORE_NAME))
+        self.latency = LatencyStats(os.path.join(output_dir, LATENCY_NAME))
+
+    def _collect_one(self, zone, target, zone_dir, full=False):
+        try:
+            session = self.pool.acquire(zone)
+        except Exception as e:
+            return {"zone": zone["zone"], "name": target["name"], "host": target["host"], "ok": False,
+                    "path": None, "error": f"bastion login failed: {e}"}
+
+        healthy = False
+        try:
+            result, healthy = collect_target(session["conn"], session["prompt"], target, zone["username"],
+                                             self.password, zone_dir, self.store, zone["zone"], self.latency,
+                                             None if full else zone["probe"])
+        except Exception as e:
+            # Channel lost mid-target: the session is dropped, the client still gets a result
+            result = {"name": target["name"], "host": target["host"], "ok": False, "path": None,
+                      "error": f"session lost: {e}"}
+        finally:
+            self.pool.release(zone, session, healthy)
+        result["zone"] = zone["zone"]
+        return result
+
+    def run_job(self, request):
+        """Yield one result dict per target as it finishes"""
+        self.jobs += 1
+        # Re-read the inventory per job so edits apply without a restart
+        zones = load_inventory(self.inventory, request.get("zones"), request.get("targets"))
+        tasks = []
+        for zone in zones:
+            zone_dir = os.path.join(self.output_dir, zone["zone"])
+            os.makedirs(zone_dir, exist_ok=True)
+            tasks += [(zone, target, zone_dir, request.get("full", False)) for target in zone["targets"]]
+        if not tasks:
+            return
+
+        with ThreadPoolExecutor(max_workers=sum(z["sessions"] for z in zones)) as pool:
+            futures = [pool.submit(self._collect_one, *task) for task in tasks]
+            for future in as_completed(futures):
+                yield future.result()
+        self.latency.save()
+
+    def status(self):
+        return dict(self.pool.status(), jobs=self.jobs)
+
+    def close(self):
+        self.pool.close_all()
+        self.latency.save()
+        self.store.close()
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """One JSON request line in, JSON result lines out"""
+
+    def handle(self):
+        daemon = self.server.collector
+        try:
+            request = json.loads(self.rfile.readline())
+        except ValueError:
+            self._send({"error": "bad request"})
+            return
+        if not isinstance(request, dict) or not hmac.compare_digest(str(request.get("token", "")),
+                                                                   self.server.token):
+            print(f"[Warn] Rejected a request without a valid token from {self.client_address[0]}")
+            self._send({"error": "unauthorized"})
+            return
+
+        action = request.get("action", "collect")
+        if action == "status":
+            self._send(daemon.status())
+        elif action == "shutdown":
+            self._send({"stopping": True})
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+        elif action == "collect":
+            start = time.perf_counter()
+            ok = total = 0
+            for result in daemon.run_job(request):
+                total += 1
+                ok += result["ok"]
+                print(f"[*] {result['zone']}/{result['name']}: {'ok' if result['ok'] else result['error']}")
+                self._send(result)
+            self._send({"done": True, "ok": ok, "total": total,
+                        "seconds": round(time.perf_counter() - start, 1)})
+        else:
+            self._send({"error": f"unknown action {action!r}"})
+
+    def _send(self, message):
+        self.wfile.write((json.dumps(message) + "\n").encode("utf-8"))
+        self.wfile.flush()
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+def serve(inventory, password, token, output_dir=DEFAULT_OUTPUT_DIR, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    daemon = CollectorDaemon(inventory, password, output_dir)
+    server = _Server((host, port), _RequestHandler)
+    server.collector = daemon
+    server.token = token
+
+    stop = threading.Event()
+
+    def keepalive_loop():
+        while not stop.wait(KEEPALIVE_INTERVAL / 2):
+            daemon.pool.keepalive()
+
+    threading.Thread(target=keepalive_loop, daemon=True).start()
+    print(f"[*] Collector daemon listening on {host}:{port} (inventory {inventory})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.server_close()
+        daemon.close()
+        print("[*] Collector daemon stopped")
+
+
+def submit(request, token, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """Send one request to a running daemon; yields its response messages"""
+    with socket.create_connection((host, port)) as sock:
+        sock.sendall((json.dumps(dict(request, token=token)) + "\n").encode("utf-8"))
+        with sock.makefile("r", encoding="utf-8") as replies:
+            for line in replies:
+                yield json.loads(line)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Long-lived collector with warm bastion sessions")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--token-file", default=DEFAULT_TOKEN_FILE, help="Shared request token (chmod 600)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_serve = sub.add_parser("serve", help="Run the daemon")
+    p_serve.add_argument("-i", "--inventory", default=DEFAULT_INVENTORY)
+    p_serve.add_argument("-o", "--output-dir", default=DEFAULT_OUTPUT_DIR)
+
+    p_collect = sub.add_parser("collect", help="Submit a collection job")
+    p_collect.add_argument("-z", "--zone", action="append", help="Zone to collect (repeatable, default: all)")
+    p_collect.add_argument("-t", "--target", action="append", help="Target name (repeatable, default: all)")
+    p_collect.add_argument("--full", action="store_true", help="Skip the change probe, pull every config")
+
+    sub.add_parser("status", help="Show open/idle sessions")
+    sub.add_parser("stop", help="Shut the daemon down")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    try:
+        token = load_token(args.token_file, create=args.command == "serve")
+    except (OSError, ValueError) as e:
+        print(f"[Error] Token file: {e}")
+        sys.exit(1)
+
+    if args.command == "serve":
+        password = os.environ.get("COLLECTOR_PASSWORD") or getpass.getpass("Password: ")
+        serve(args.inventory, password, token, args.output_dir, args.host, args.port)
+        return
+
+    if args.command == "collect":
+        request = {"action": "collect", "zones": args.zone, "targets": args.target, "full": args.full}
+    elif args.command == "status":
+        request = {"action": "status"}
+    else:
+        request = {"action": "shutdown"}
+
+    try:
+        if args.command != "collect":
+            for reply in submit(request, token, args.host, args.port):
+                print(json.dumps(reply, indent=2))
+            return
+
+        failed = 0
+        for reply in submit(request, token, args.host, args.port):
+            if "error" in reply and "zone" not in reply:
+                print(f"[Error] {reply['error']}")
+                sys.exit(1)
+            if reply.get("done"):
+                print(f"[*] Collected {reply['ok']}/{reply['total']} devices in {reply['seconds']}s")
+            elif reply["ok"]:
+                print(f"[*] {reply['zone']}/{reply['name']} -> {reply['path']}")
+            else:
+                failed += 1
+                print(f"[Error] {reply['zone']}/{reply['name']}: {reply['error']}")
+        sys.exit(1 if failed else 0)
+    except ConnectionRefusedError:
+        print(f"[Error] No collector daemon on {args.host}:{args.port} (start it with 'serve')")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
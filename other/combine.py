@@ -1,41 +1,48 @@
-import pandas as pd
-from openpyxl import load_workbook
 import os
+import argparse
+
+from cabling_plan import PORT_MAPPING_SHEET, concat_sheets, consolidate, read_plan_values
 
 # Folder containing the excel files
 folder_path = r'C:\\Users\\cleung9\\Desktop\\Relocation\\Wave7'
+output_file = 'combined_file_with_source.xlsx'
 
-# List all excel files in the folder
-excel_files = [os.path.join(folder_path, file) for file in os.listdir(folder_path) if file.endswith('.xlsx')]
 
-# Create an empty dataframe to store the combined data
-combined_df = pd.DataFrame()
+def parse_args():
+    parser = argparse.ArgumentParser(description="Combine the 'Port mapping (IP)' sheet of every plan in a folder")
+    parser.add_argument("folder", nargs="?", default=folder_path)
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Process pool size")
+    parser.add_argument("--cache-dir", default=None, help="Extracted-sheet cache (default: plan_cache/<folder name>)")
+    parser.add_argument("--no-cache", action="store_true", help="Re-read every plan")
+    return parser.parse_args()
 
 
-# Function to ensure unique column names
-def deduplicate_columns(columns):
-    seen = set()
-    for i, col in enumerate(columns):
-        if col in seen:
-            columns[i] = f"{col}_{i}"
-        seen.add(columns[i])
-    return columns
+def main():
+    args = parse_args()
+    cache_dir = None if args.no_cache else (
+        args.cache_dir or os.path.join("plan_cache", os.path.basename(os.path.normpath(args.folder))))
 
+    # List all excel files in the folder
+    excel_files = [os.path.join(args.folder, file) for file in os.listdir(args.folder) if file.endswith('.xlsx')]
 
-# Iterate over each excel file and append its content to the combined dataframe
-for file in excel_files:
-    wb = load_workbook(file)
-    if 'Port mapping (IP)' in wb.sheetnames:
-        sheet = wb['Port mapping (IP)']
-        data = sheet.values
-        columns = next(data)
-        columns = deduplicate_columns(list(columns))  # Ensure unique column names
-        df = pd.DataFrame(data, columns=columns)
+    # Read every plan once (read-only, in parallel, unchanged plans from the cache)
+    frames = []
+    for file, sheets in consolidate(excel_files, [PORT_MAPPING_SHEET], read_plan_values, args.workers, cache_dir):
+        if PORT_MAPPING_SHEET not in sheets:
+            print(f"[Warn] Skipping {os.path.basename(file)}: no '{PORT_MAPPING_SHEET}' sheet")
+            continue
+        df = sheets[PORT_MAPPING_SHEET]
         df['Source File'] = file  # Add a column for the source file
+        frames.append(sheets)
+
+    # Single concat at the end
+    combined_df = concat_sheets(frames, [PORT_MAPPING_SHEET])[PORT_MAPPING_SHEET]
+
+    # Save the combined dataframe to a new excel file
+    combined_df.to_excel(output_file, index=False)
 
-        combined_df = pd.concat([combined_df, df], ignore_index=True)
+    print(f"The excel files have been successfully combined into '{output_file}'.")
 
-# Save the combined dataframe to a new excel file
-combined_df.to_excel('combined_file_with_source.xlsx', index=False)
 
-print("The excel files have been successfully combined into 'combined_file_with_source.xlsx'.")
\ No newline at end of file
+if __name__ == '__main__':
+    main()
@@ -1,47 +1,73 @@
-import pandas as pd
-import glob
 import os
-from openpyxl import load_workbook
+import glob
+import argparse
+import pandas as pd
 
+from cabling_plan import PORT_MAPPING_SHEET, SAN_MAPPING_SHEET, concat_sheets, consolidate, read_plan_sheets
+from patching_store import STORE_NAME, PatchingStore
+
+# Plans are only ever read: no unhide-and-save, and nothing is written into
+# folder_path (the record goes to --output-dir, the cache to plan_cache/<wave>)
 folder_path = r"C:\Users\cleung9\Desktop\Relocation\Wave1"
-pattern = os.path.join(folder_path, "[!~$]*.xlsx")
-excel_files = glob.glob(pattern)
-sheet_names = ["Port mapping (IP)", "Port mapping (SAN Switch)"]
-
-combined_data = {sheet: [] for sheet in sheet_names}
-for file in excel_files:
-    try:
-        wb = load_workbook(file)
-        for ws in wb.worksheets:
-            for col_dim in ws.column_dimensions.values():
-                col_dim.hidden = False
-            for row_idx in range(1, ws.max_row + 1):
-                ws.row_dimensions[row_idx].hidden = False
-            ws.auto_filter.ref = None
-        wb.save(file)
-
-        xls = pd.ExcelFile(file, engine="openpyxl")
+sheet_names = [PORT_MAPPING_SHEET, SAN_MAPPING_SHEET]
+OUTPUT_PREFIX = "DCNI - Consolidated Patching Record"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Consolidate a Wave folder of cabling plans into one patching record")
+    parser.add_argument("folder", nargs="?", default=folder_path)
+    parser.add_argument("-o", "--output-dir", default=".", help="Where the consolidated record is written")
+    parser.add_argument("--store", default=None, help=f"SQLite copy of the record (default: <output-dir>/{STORE_NAME})")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Process pool size")
+    parser.add_argument("--cache-dir", default=None, help="Extracted-sheet cache (default: plan_cache/<wave>)")
+    parser.add_argument("--no-cache", action="store_true", help="Re-read every plan")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    folder = args.folder
+    wave = os.path.basename(os.path.normpath(folder))    # e.g. "Wave1"
+    cache_dir = None if args.no_cache else (args.cache_dir or os.path.join("plan_cache", wave))
+
+    pattern = os.path.join(folder, "[!~$]*.xlsx")
+    # Skip a consolidated record left in the folder by an earlier run
+    excel_files = sorted(f for f in glob.glob(pattern) if not os.path.basename(f).startswith(OUTPUT_PREFIX))
+
+    frames = []
+    for file, sheets in consolidate(excel_files, sheet_names, read_plan_sheets, args.workers, cache_dir):
         filename = os.path.basename(file)
-        # Project Owner substring: up to first '_', plus "_Wave1"
-        project_owner = filename.split("_")[0] + "_Wave1"
-        for sheet in sheet_names:
-            if sheet in xls.sheet_names:
-                df = pd.read_excel(file, sheet_name=sheet, engine="openpyxl")
+        # Project Owner substring: up to first '_', plus "_<wave>"
+        project_owner = filename.split("_")[0] + f"_{wave}"
+        try:
+            for df in sheets.values():
                 df.insert(0, "File Version", filename)
                 df.insert(1, "Project Owner", project_owner)
                 df.insert(2, "Patch Panel Connection Ref.", "")
-                combined_data[sheet].append(df)
-    except Exception as e:
-        print(f"Skipping {os.path.basename(file)}: {e}")
+        except Exception as e:
+            # e.g. a plan that already carries a "File Version" column: leave just that plan out
+            print(f"Skipping {filename}: {e}")
+            continue
+        frames.append(sheets)
 
-for sheet, dfs in combined_data.items():
-    dfs_valid = [df for df in dfs if not df.empty]
-    combined_data[sheet] = pd.concat(dfs_valid, ignore_index=True) if dfs_valid else pd.DataFrame()
+    combined_data = concat_sheets(frames, sheet_names)
 
+    os.makedirs(args.output_dir, exist_ok=True)
+    output_path = os.path.join(args.output_dir, f"{OUTPUT_PREFIX} ({wave}).xlsx")
+    with pd.ExcelWriter(output_path, engine="xlsxwriter") as writer:
+        for sheet in sheet_names:
+            combined_data[sheet].to_excel(writer, sheet_name=sheet, index=False)
+
+    print("Combined workbook written to:", output_path)
+
+    # Same rows, partitioned by wave and sheet, for scripts that query the record
+    store_path = args.store or os.path.join(args.output_dir, STORE_NAME)
+    with PatchingStore(store_path) as store:
+        for sheet in sheet_names:
+            if not combined_data[sheet].empty:
+                store.write(wave, sheet, combined_data[sheet])
+    print("Patching record store updated:", store_path)
 
-output_path = os.path.join(folder_path, "DCNI - Consolidated Patching Record (Wave1).xlsx")
-with pd.ExcelWriter(output_path, engine="xlsxwriter") as writer:
-    for sheet in sheet_names:
-        combined_data[sheet].to_excel(writer, sheet_name=sheet, index=False)
 
-print("Combined workbook written to:", output_path)
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,269 @@
+import os
+import re
+import sys
+import json
+import argparse
+from collections import deque
+
+# Shared helpers (interface_names.py, ...) live in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from interface_names import canonical_name
+from capture_store import CaptureStore, parse_session_log
+
+# ==============================================================================
+# FLEET LLDP TOPOLOGY
+#
+# Every device's 'display lldp neighbor brief' folded into one adjacency-indexed
+# graph: neighbor and path queries are dict lookups / a BFS, links whose far end
+# does not report them back are flagged, and the graph is saved as JSON so
+# questions during a migration never re-read capture text.
+#
+#   python lldp_topology.py build topology.json --store captures/captures.db
+#   python lldp_topology.py build topology.json --log session.log source.txt
+#   python lldp_topology.py neighbors topology.json ANPNHQSBTZ01C02
+#   python lldp_topology.py path topology.json ANPNHQSBTZ01C02 ANPNHQDCIRT02
+#   python lldp_topology.py check topology.json
+# ==============================================================================
+
+LLDP_COMMAND = 'display lldp neighbor brief'
+
+# Header -> (local, neighbor interface, neighbor device) column positions.
+# CE switches and NE routers print the same table with different column orders.
+LLDP_LAYOUTS = [
+    (re.compile(r'Local Interface\s+Exptime\(s\)\s+Neighbor Interface\s+Neighbor Device'), (0, 2, 3)),
+    (re.compile(r'Local Intf\s+Neighbor Dev\s+Neighbor Intf\s+Exptime'), (0, 2, 1)),
+]
+LLDP_COLUMN_GAP = re.compile(r'\s{2,}')
+
+# Link states from check()
+LINK_OK = "ok"
+LINK_MISSING_REVERSE = "missing reverse"    # far end collected, but reports nothing on that port
+LINK_MISMATCH = "mismatch"                  # far end reports that port facing somewhere else
+LINK_UNOBSERVED = "unobserved"              # far end not collected
+
+
+class Topology:
+    """
+    adjacency[device][local_interface] = (neighbor_device, neighbor_interface)
+    observed = devices whose own LLDP table was ingested
+    """
+
+    def __init__(self):
+        self.adjacency = {}
+        self.observed = set()
+        self._reverse = None
+        self._canonical = None
+
+    def add_device(self, hostname, neighbors):
+        """neighbors: [(local_interface, neighbor_device, neighbor_interface)] for one device;
+        replaces whatever was ingested for it before"""
+        self.observed.add(hostname)
+        self._reverse = self._canonical = None
+        self.adjacency[hostname] = {local: (neighbor, remote) for local, neighbor, remote in neighbors}
+
+    def links(self):
+        for device, ports in self.adjacency.items():
+            for local, (neighbor, remote) in ports.items():
+                yield device, local, neighbor, remote
+
+    def neighbors(self, device):
+        """[(local_interface, neighbor_device, neighbor_interface)] as reported by device,
+        plus links other devices report towards it that it does not report itself"""
+        result = {canonical_name(local): (local, neighbor, remote)
+                  for local, (neighbor, remote) in self.adjacency.get(device, {}).items()}
+        for other, local, neighbor, remote in self._links_towards(device):
+            result.setdefault(canonical_name(remote), (remote, other, local))
+        return sorted(result.values())
+
+    def _links_towards(self, device):
+        # Reverse index built once per graph change, not per query
+        if self._reverse is None:
+            self._reverse = {}
+            for link in self.links():
+                self._reverse.setdefault(link[2], []).append(link)
+        return self._reverse.get(device, [])
+
+    def _port(self, device, interface):
+        """(neighbor, neighbor_interface) reported on device's interface, any spelling of its name"""
+        if self._canonical is None:
+            self._canonical = {
+                (dev, canonical_name(local)): far for dev, ports in self.adjacency.items()
+                for local, far in ports.items()
+            }
+        return self._canonical.get((device, canonical_name(interface)))
+
+    def device_graph(self):
+        """Undirected device -> set(devices), links seen from either end"""
+        graph = {}
+        for device, _, neighbor, _ in self.links():
+            graph.setdefault(device, set()).add(neighbor)
+            graph.setdefault(neighbor, set()).add(device)
+        return graph
+
+    def path(self, source, target):
+        """Shortest device path (fewest hops) or None"""
+        graph = self.device_graph()
+        if source not in graph or target not in graph:
+            return None
+        previous = {source: None}
+        queue = deque([source])
+        while queue:
+            device = queue.popleft()
+            if device == target:
+                hops = []
+                while device is not None:
+                    hops.append(device)
+                    device = previous[device]
+                return hops[::-1]
+            for neighbor in sorted(graph[device]):
+                if neighbor not in previous:
+                    previous[neighbor] = device
+                    queue.append(neighbor)
+        return None
+
+    def check(self):
+        """[(state, device, local, neighbor, remote)] for every reported link"""
+        report = []
+        for device, local, neighbor, remote in self.links():
+            if neighbor not in self.observed:
+                state = LINK_UNOBSERVED
+            else:
+                back = self._port(neighbor, remote)
+                if back is None:
+                    state = LINK_MISSING_REVERSE
+                elif back[0] == device and canonical_name(back[1]) == canonical_name(local):
+                    state = LINK_OK
+                else:
+                    state = LINK_MISMATCH
+            report.append((state, device, local, neighbor, remote))
+        return report
+
+    def save(self, path):
+        data = {
+            "observed": sorted(self.observed),
+            "links": [list(link) for link in self.links()],
+        }
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        topology = cls()
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        topology.observed = set(data["observed"])
+        for device, local, neighbor, remote in data["links"]:
+            topology.adjacency.setdefault(device, {})[local] = (neighbor, remote)
+        return topology
+
+
+def parse_lldp_table(output):
+    """[(local_interface, neighbor_device, neighbor_interface)] from one
+    'display lldp neighbor brief' output, either header layout.
+    Names are kept as the device prints them; check() and neighbors()
+    compare them canonically."""
+    rows = []
+    columns = None
+    for line in output.splitlines():
+        if columns is None:
+            for header, positions in LLDP_LAYOUTS:
+                if header.search(line):
+                    columns = positions
+                    break
+            continue
+        if not line.strip() or line.startswith('-----'):
+            continue
+        parts = LLDP_COLUMN_GAP.split(line.strip())
+        if len(parts) < 4:
+            continue        # no neighbor device name advertised
+        local, remote, neighbor = (parts[i] for i in columns)
+        rows.append((local, neighbor, remote))
+    return rows
+
+
+def build_topology(store_path=None, logs=None):
+    topology = Topology()
+
+    if store_path:
+        with CaptureStore(store_path) as store:
+            for device in store.devices():
+                output = store.latest(device, LLDP_COMMAND)
+                if output is not None:
+                    topology.add_device(device, parse_lldp_table(output))
+
+    for log in logs or []:
+        for device, command, output in parse_session_log(log):
+            if command == LLDP_COMMAND:
+                topology.add_device(device, parse_lldp_table(output))
+
+    return topology
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Fleet LLDP topology graph")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_build = sub.add_parser("build", help="Ingest LLDP tables and save the graph")
+    p_build.add_argument("topology")
+    p_build.add_argument("--store", default=None, help="Collector capture store")
+    p_build.add_argument("--log", nargs="+", default=None, help="Session logs / source.txt captures")
+
+    p_neighbors = sub.add_parser("neighbors", help="Ports and neighbors of one device")
+    p_neighbors.add_argument("topology")
+    p_neighbors.add_argument("device")
+
+    p_path = sub.add_parser("path", help="Shortest device path between two devices")
+    p_path.add_argument("topology")
+    p_path.add_argument("source")
+    p_path.add_argument("target")
+
+    p_check = sub.add_parser("check", help="List links without a matching reverse entry")
+    p_check.add_argument("topology")
+    p_check.add_argument("--all", action="store_true", help="Also list unobserved far ends")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    if args.command == "build":
+        if not args.store and not args.log:
+            print("[Error] Give --store and/or --log")
+            sys.exit(1)
+        topology = build_topology(args.store, args.log)
+        topology.save(args.topology)
+        n_links = sum(len(ports) for ports in topology.adjacency.values())
+        print(f"[*] {len(topology.observed)} devices, {n_links} LLDP links -> {args.topology}")
+        return
+
+    topology = Topology.load(args.topology)
+
+    if args.command == "neighbors":
+        rows = topology.neighbors(args.device)
+        for local, neighbor, remote in rows:
+            print(f"{local}\t{neighbor}\t{remote}")
+        print(f"[*] {args.device}: {len(rows)} neighbors", file=sys.stderr)
+
+    elif args.command == "path":
+        hops = topology.path(args.source, args.target)
+        if hops is None:
+            print(f"[Error] No LLDP path between {args.source} and {args.target}")
+            sys.exit(1)
+        print(" -> ".join(hops))
+
+    else:
+        report = topology.check()
+        flagged = [r for r in report if r[0] in (LINK_MISSING_REVERSE, LINK_MISMATCH)
+                   or (args.all and r[0] == LINK_UNOBSERVED)]
+        for state, device, local, neighbor, remote in flagged:
+            print(f"{state}\t{device} {local}\t-> {neighbor} {remote}")
+        counts = {}
+        for state, *_ in report:
+            counts[state] = counts.get(state, 0) + 1
+        print("[*] " + ", ".join(f"{state}: {n}" for state, n in sorted(counts.items())), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
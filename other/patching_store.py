@@ -0,0 +1,157 @@
+import sys
+import time
+import sqlite3
+import argparse
+import pandas as pd
+
+from cabling_plan import PORT_MAPPING_SHEET
+
+# ==============================================================================
+# PATCHING RECORD STORE
+#
+# The consolidated patching records (combine2.py) as SQLite, one table per
+# (wave, sheet) partition with File Version and Project Owner as indexed
+# columns, so downstream scripts load the rows they need without reopening
+# the xlsx. The xlsx stays the human-facing export.
+#
+#   python patching_store.py list patching_records.db
+#   python patching_store.py export patching_records.db Wave6 out.xlsx --owner "OCSSS(PROD)_Wave6"
+# ==============================================================================
+
+STORE_NAME = "patching_records.db"
+FILTER_COLUMNS = {"file_version": "File Version", "project_owner": "Project Owner"}
+
+CATALOG = """
+CREATE TABLE IF NOT EXISTS partitions (
+    wave        TEXT NOT NULL,
+    sheet       TEXT NOT NULL,
+    table_name  TEXT NOT NULL,
+    row_count   INTEGER NOT NULL,
+    written_at  REAL NOT NULL,
+    PRIMARY KEY (wave, sheet)
+)
+"""
+
+
+def _quote(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _sqlite_columns(columns):
+    """SQLite column names are case-insensitive: suffix case-only duplicates"""
+    seen = set()
+    names = []
+    for i, col in enumerate(map(str, columns)):
+        name = col if col.lower() not in seen else f"{col}_{i}"
+        seen.add(name.lower())
+        names.append(name)
+    return names
+
+
+class PatchingStore:
+    """
+    with PatchingStore("patching_records.db") as store:
+        store.write("Wave6", "Port mapping (IP)", df)
+        df = store.read("Wave6", project_owner="OCSSS(PROD)_Wave6")
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(CATALOG)
+        self.conn.commit()
+
+    def write(self, wave, sheet, df):
+        """Replace the (wave, sheet) partition with df"""
+        table = f"{wave}/{sheet}"
+        df = df.set_axis(_sqlite_columns(df.columns), axis=1)
+        with self.conn:
+            self.conn.execute(f"DROP TABLE IF EXISTS {_quote(table)}")
+            df.to_sql(table, self.conn, index=False)
+            for column in FILTER_COLUMNS.values():
+                if column in df.columns:
+                    self.conn.execute(f"CREATE INDEX {_quote(f'{table}/{column}')} "
+                                      f"ON {_quote(table)} ({_quote(column)})")
+            self.conn.execute("INSERT OR REPLACE INTO partitions VALUES (?, ?, ?, ?, ?)",
+                              (wave, sheet, table, len(df), time.time()))
+
+    def partitions(self):
+        """[(wave, sheet, rows, written_at)]"""
+        return self.conn.execute(
+            "SELECT wave, sheet, row_count, written_at FROM partitions ORDER BY wave, sheet").fetchall()
+
+    def read(self, wave=None, sheet=PORT_MAPPING_SHEET, columns=None, file_version=None, project_owner=None):
+        """
+        Rows of one sheet, from one wave or (wave=None) all of them.
+        file_version / project_owner: exact value or list of values.
+        """
+        waves = [wave] if wave else [w for w, s, _, _ in self.partitions() if s == sheet]
+        frames = []
+        for w in waves:
+            row = self.conn.execute("SELECT table_name FROM partitions WHERE wave = ? AND sheet = ?",
+                                    (w, sheet)).fetchone()
+            if row is None:
+                continue
+            select = ", ".join(map(_quote, columns)) if columns else "*"
+            clauses, params = [], []
+            for key, value in (("file_version", file_version), ("project_owner", project_owner)):
+                if value is None:
+                    continue
+                values = [value] if isinstance(value, str) else list(value)
+                clauses.append(f"{_quote(FILTER_COLUMNS[key])} IN ({', '.join('?' * len(values))})")
+                params += values
+            query = f"SELECT {select} FROM {_quote(row[0])}"
+            if clauses:
+                query += " WHERE " + " AND ".join(clauses)
+            frames.append(pd.read_sql_query(query, self.conn, params=params))
+        frames = [f for f in frames if not f.empty]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Consolidated patching records as SQLite partitions")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_list = sub.add_parser("list", help="Waves and sheets in the store")
+    p_list.add_argument("store")
+
+    p_export = sub.add_parser("export", help="Write a subset to xlsx / csv")
+    p_export.add_argument("store")
+    p_export.add_argument("wave")
+    p_export.add_argument("output", help="*.xlsx or *.csv")
+    p_export.add_argument("--sheet", default=PORT_MAPPING_SHEET)
+    p_export.add_argument("--owner", action="append", help="Project Owner (repeatable)")
+    p_export.add_argument("--file", action="append", help="File Version (repeatable)")
+
+    args = parser.parse_args()
+
+    with PatchingStore(args.store) as store:
+        if args.command == "list":
+            for wave, sheet, rows, written_at in store.partitions():
+                stamp = time.strftime("%Y-%m-%d %H:%M", time.localtime(written_at))
+                print(f"{wave}\t{sheet}\t{rows}\t{stamp}")
+            return
+
+        df = store.read(args.wave, args.sheet, file_version=args.file, project_owner=args.owner)
+        if df.empty:
+            print(f"[Error] No rows for {args.wave} / {args.sheet}")
+            sys.exit(1)
+        if args.output.lower().endswith(".csv"):
+            df.to_csv(args.output, index=False)
+        else:
+            df.to_excel(args.output, index=False)
+        print(f"[*] {len(df)} rows -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
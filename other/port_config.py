@@ -0,0 +1,139 @@
+import os
+import re
+import sys
+from string import Formatter
+import numpy as np
+import pandas as pd
+
+# Shared helpers (interface_names.py, ...) live in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from interface_names import canonicalize
+
+# ==============================================================================
+# PORT CONFIG RENDERER
+#
+# Renders Huawei interface stanzas for every row of a cabling plan by
+# concatenating whole column Series (one string op per template field, not a
+# Python call per row), and writes them out as one push-ready file per A End
+# switch.
+# ==============================================================================
+
+# {Column} fields are filled from the plan's columns; write_switch_configs leaves
+# out a line whose field is empty in that row (no 'description TO_nan')
+ACCESS_PORT_TEMPLATE = [
+    "interface {A End Information}",
+    "description TO_{B-end Panel Name}",
+    "undo enable snmp trap updown",
+    "port link-type access",
+    "port default vlan {VLAN no}",
+    "stp edged-port enable",
+    "storm suppression unknown-unicast 85",
+    "storm suppression multicast 85",
+    "storm suppression broadcast 85",
+    "lldp disable",
+]
+
+# Wrapped around each switch's stanzas (CE switches only apply configuration on commit)
+CONFIG_HEADER = ["system-view"]
+CONFIG_FOOTER = ["commit", "return"]
+
+HOSTNAME_COLUMN = 'A End Hostname'
+INTERFACE_COLUMN = 'A End Information'
+VLAN_COLUMN = 'VLAN no'
+MODE_COLUMN = 'Access / Trunk Mode'
+REASON_COLUMN = 'Reason'
+CONFIG_SUFFIX = ".cfg"
+VLAN_RANGE = (1, 4094)
+
+
+def render_template(df, template, sep="\n", drop_missing=False):
+    """
+    Series with template (list of lines) rendered for every row of df.
+    drop_missing=True leaves out, row by row, every line with a field that is
+    NaN or blank in that row.
+    """
+    if drop_missing:
+        rendered = np.full(len(df), "", dtype=object)
+        for line in template:
+            text = render_template(df, [line]).to_numpy()
+            missing = np.zeros(len(df), dtype=bool)
+            for _, field, _, _ in Formatter().parse(line):
+                if field is not None:
+                    missing |= (df[field].isna() | (df[field].astype(str).str.strip() == '')).to_numpy()
+            rendered = rendered + np.where(missing, "", text + sep)
+        return pd.Series(rendered, index=df.index, dtype=object).str.removesuffix(sep)
+
+    rendered = np.full(len(df), "", dtype=object)
+    for literal, field, _, _ in Formatter().parse(sep.join(template)):
+        if literal:
+            rendered = rendered + literal
+        if field is not None:
+            # str() of every cell like an f-string would (NaN -> 'nan', 551.0 -> '551.0')
+            rendered = rendered + np.asarray(df[field], dtype=str).astype(object)
+    return pd.Series(rendered, index=df.index, dtype=object)
+
+
+def switch_interface(info):
+    """'ITPNHQSBRZ11T21: 10GE/1/0/22' -> '10GE1/0/22' (the port part, as written on the switch)"""
+    ports = info.astype(str).str.split(':', n=1).str[-1].str.strip()
+    return ports.str.replace(r'^(\d*[A-Za-z][A-Za-z\-]*)\s*/', r'\1', regex=True)
+
+
+def config_filename(hostname):
+    """Hostname as a file name: anything but word characters, '.' and '-' becomes '_'"""
+    return re.sub(r'[^\w.-]', '_', hostname) + CONFIG_SUFFIX
+
+
+def push_ready_rows(df):
+    """
+    Rows of the plan that can be pushed as access ports, with the interface and
+    VLAN columns cleaned up for the CLI. Returns (rows, rows left out, rejected
+    rows): rejected rows are also left out, with REASON_COLUMN saying why (an
+    interface that is not an interface name, a VLAN outside VLAN_RANGE).
+    """
+    vlan = pd.to_numeric(df[VLAN_COLUMN], errors='coerce')
+    usable = df[HOSTNAME_COLUMN].notna() & df[INTERFACE_COLUMN].notna() & vlan.notna()
+    if MODE_COLUMN in df.columns:
+        mode = df[MODE_COLUMN].astype(str).str.strip().str.lower()
+        usable &= df[MODE_COLUMN].isna() | (mode == 'access')
+
+    rows = df.loc[usable].copy()
+    rows[INTERFACE_COLUMN] = switch_interface(rows[INTERFACE_COLUMN])
+    rows[REASON_COLUMN] = ''
+    # 'TBC', 'N/A', a bare port number ... would not be accepted by 'interface'
+    parsed = {name: canonicalize(name) for name in rows[INTERFACE_COLUMN].unique()}
+    known = rows[INTERFACE_COLUMN].map({name: p.type for name, p in parsed.items()}) != ''
+    rows.loc[~known, REASON_COLUMN] = "'" + rows[INTERFACE_COLUMN] + "' is not an interface name"
+    # 'port default vlan' only takes a whole VLAN ID in range
+    vlan = vlan[rows.index]
+    bad_vlan = known & ~(vlan.between(*VLAN_RANGE) & (vlan % 1 == 0))
+    rows.loc[bad_vlan, REASON_COLUMN] = ("VLAN '" + df.loc[bad_vlan[bad_vlan].index, VLAN_COLUMN].astype(str)
+                                         + f"' is not a VLAN ID ({VLAN_RANGE[0]}-{VLAN_RANGE[1]})")
+    rejected = rows.loc[rows[REASON_COLUMN] != '']
+    rows = rows.loc[rows[REASON_COLUMN] == ''].drop(columns=REASON_COLUMN)
+    rows[VLAN_COLUMN] = vlan[rows.index].astype(int).astype(str)
+    rows[HOSTNAME_COLUMN] = rows[HOSTNAME_COLUMN].astype(str).str.strip()
+
+    # A port listed twice (e.g. in two plan versions, however it is spelt) is configured once, last row wins
+    ports = pd.DataFrame({'host': rows[HOSTNAME_COLUMN],
+                          'port': rows[INTERFACE_COLUMN].map({name: p.canonical for name, p in parsed.items()})})
+    rows = rows.loc[~ports.duplicated(keep='last')]
+    return rows, len(df) - len(rows), rejected
+
+
+def write_switch_configs(df, output_dir, template=ACCESS_PORT_TEMPLATE):
+    """
+    One <A End Hostname>.cfg per switch with a '#'-separated stanza per port.
+    Returns ({hostname: (path, ports)}, skipped rows, rejected rows).
+    """
+    rows, skipped, rejected = push_ready_rows(df)
+    rows['stanza'] = render_template(rows, template, drop_missing=True)
+
+    os.makedirs(output_dir, exist_ok=True)
+    written = {}
+    for hostname, stanzas in rows.groupby(HOSTNAME_COLUMN, sort=True)['stanza']:
+        path = os.path.join(output_dir, config_filename(hostname))
+        with open(path, "w", encoding="utf-8", newline="\n") as f:
+            f.write("\n#\n".join(["\n".join(CONFIG_HEADER), *stanzas, "\n".join(CONFIG_FOOTER)]) + "\n")
+        written[hostname] = (path, len(stanzas))
+    return written, skipped, rejected
@@ -1,32 +1,10 @@
-import pandas as pd
-from openpyxl import load_workbook
+from cabling_plan import read_plan_sheet
 
-# Load the Excel file with data_only=True to evaluate formulas
 file_path = r'C:\Users\cleung9\Desktop\Relocation\Wave6\OCSSS(PROD)_point-to-point_cabling_plan_20241121_v0.17.xlsx'  # Using raw string literal for the file path
-wb1 = load_workbook(file_path, data_only=True)
-sheet = wb1['Port mapping (IP)']  # Replace with the correct sheet name
 
-# Unhide all columns
-for col in sheet.column_dimensions.values():
-    col.hidden = False
-
-# Unhide all rows
-for row in sheet.row_dimensions.values():
-    row.hidden = False
-
-# Remove filters
-if sheet.auto_filter.ref:
-    sheet.auto_filter.ref = None
-
-# Save the modified workbook to a temporary file
-temp_file_path = 'temp_unhidden.xlsx'
-wb1.save(temp_file_path)
-
-# Load the modified workbook with pandas
-df = pd.read_excel(temp_file_path, sheet_name='Port mapping (IP)', engine='openpyxl')
-
-# Clean up column names by stripping any leading/trailing spaces and replacing newline characters
-df.columns = df.columns.str.strip().str.replace('\n', ' ')
+# Read the sheet straight from the plan (read-only; hidden rows/columns and filters don't matter),
+# with leading/trailing spaces and newline characters cleaned out of the column names
+df = read_plan_sheet(file_path, 'Port mapping (IP)')
 
 # Print the cleaned column names to check for any discrepancies
 print("Cleaned Column Names:")
@@ -0,0 +1,402 @@
+import sys
+import json
+import time
+import zlib
+import asyncio
+import argparse
+import threading
+
+from capture_store import parse_session_log
+
+# ==============================================================================
+# SIMULATED HUAWEI VRP CLI
+#
+# Telnet-style stand-in for the zone bastions and the switches behind them,
+# replaying recorded command outputs (source.txt, ANPNHQDCIRT02.log, ...) with
+# the stelnet hop dialog and configurable per-command latency. One listener
+# per zone bastion; every inventory target (or --synthetic N devices) is
+# reachable from it by stelnet, so hundreds of devices cost no extra ports.
+#
+#   python vrp_sim.py -i inventory.json --write-inventory sim_inventory.json
+#   python collector.py -i sim_inventory.json -o sim_captures     (COLLECTOR_PASSWORD=any)
+#
+#   python vrp_sim.py --synthetic 500 --scale 0.1 --write-inventory sim_inventory.json
+# ==============================================================================
+
+DEFAULT_RECORDINGS = ["source.txt", "ANPNHQDCIRT02.log", "session.log"]
+DEFAULT_BASE_PORT = 2300
+VTY_LIMIT = 15                 # "The max number of VTY users is 15" on the real bastions
+CORE_FACTOR = 3.0              # core/distribution switches answer this much slower
+
+# Seconds per command before the output starts; anything else uses DEFAULT_LATENCY
+COMMAND_LATENCY = {
+    'display current-configuration interface': 1.0,
+    'display interface description': 0.3,
+    'display lldp neighbor brief': 0.2,
+}
+DEFAULT_LATENCY = 0.05
+LOGIN_STEP_LATENCY = 0.2       # per stelnet dialog step
+
+UNRECOGNIZED = "              ^\nError: Unrecognized command found at '^' position.\n"
+SCREEN_LENGTH_INFO = "Info: The configuration takes effect on the current user terminal interface only.\n"
+
+IAC, SB, SE = 255, 250, 240
+
+
+class SimDevice:
+    __slots__ = ("hostname", "outputs", "role", "commit")
+
+    def __init__(self, hostname, outputs, role=None, commit=None):
+        self.hostname = hostname
+        self.outputs = outputs
+        self.role = role
+        # Stable per hostname, so the collector's change probe sees "unchanged" across runs
+        self.commit = commit or f"{zlib.crc32(hostname.encode('utf-8')):010d}"
+
+    @property
+    def prompt(self):
+        return f"<{self.hostname}>"
+
+    def answer(self, command):
+        if command.startswith("screen-length"):
+            return SCREEN_LENGTH_INFO
+        if command == "display configuration commit list 1":
+            return (" No.  CommitId      Label   User      Timestamp\n"
+                    f" 1    {self.commit}    -       pccw2023  2025-06-24 22:37:08+08:00\n")
+        return self.outputs.get(command, UNRECOGNIZED)
+
+
+def load_recordings(paths):
+    """[(hostname, {command: output})] for every recorded device that ran a display command"""
+    devices = {}
+    for path in paths:
+        try:
+            for hostname, command, output in parse_session_log(path):
+                if command.startswith("display"):
+                    devices.setdefault(hostname, {})[command] = output
+        except FileNotFoundError:
+            print(f"[Warn] Recording not found: {path}")
+    return list(devices.items())
+
+
+def clone_device(recording, hostname, role=None):
+    """A recorded device's outputs under another hostname"""
+    original, outputs = recording
+    return SimDevice(hostname, {cmd: text.replace(original, hostname) for cmd, text in outputs.items()}, role)
+
+
+def build_zones(recordings, inventory=None, synthetic=0):
+    """
+    {zone: {"bastion": SimDevice, "devices": {ip: SimDevice}}}
+    from the inventory's targets and/or N synthetic devices in zone "SIM".
+    """
+    zones = {}
+    i = 0
+    if inventory:
+        with open(inventory, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        for zone_name, zone in data["zones"].items():
+            devices = {}
+            for target in zone["targets"]:
+                devices[target["host"]] = clone_device(recordings[i % len(recordings)], target["name"],
+                                                       target.get("role"))
+                i += 1
+            zones[zone_name] = {"bastion": SimDevice(f"{zone_name}-BASTION", {}), "devices": devices}
+
+    if synthetic:
+        devices = {}
+        for n in range(synthetic):
+            ip = f"10.255.{n // 250}.{n % 250 + 1}"
+            role = "core" if n % 10 == 0 else "access"
+            devices[ip] = clone_device(recordings[n % len(recordings)], f"SIM{n + 1:04d}", role)
+        zones["SIM"] = {"bastion": SimDevice("SIM-BASTION", {}), "devices": devices}
+    return zones
+
+
+class _Terminal:
+    """Line I/O over one TCP connection; strips telnet negotiation, echoes like a VTY"""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.buffer = bytearray()
+
+    async def write(self, text):
+        self.writer.write(text.replace("\r\n", "\n").replace("\n", "\r\n").encode("utf-8"))
+        await self.writer.drain()
+
+    async def readline(self, echo=True):
+        """Next input line (None on disconnect); Ctrl+C comes back as '\\x03'"""
+        while True:
+            line = self._take_line()
+            if line is not None:
+                if echo:
+                    await self.write(line + "\n")
+                return line
+            data = await self.reader.read(4096)
+            if not data:
+                return None
+            self.buffer += data
+
+    def _take_line(self):
+        buf = self.buffer
+        # Drop telnet option negotiation (IAC WILL/WONT/DO/DONT x, IAC SB ... IAC SE)
+        i = 0
+        clean = bytearray()
+        while i < len(buf):
+            byte = buf[i]
+            if byte == IAC:
+                if i + 1 >= len(buf):
+                    break
+                if buf[i + 1] == SB:
+                    end = buf.find(bytes([IAC, SE]), i + 2)
+                    if end < 0:
+                        break
+                    i = end + 2
+                    continue
+                i += 3 if buf[i + 1] in (251, 252, 253, 254) else 2
+                continue
+            if byte == 3:
+                self.buffer = buf[i + 1:]
+                return "\x03"
+            if byte in (10, 13):
+                # \r\n, \r\0 and \n all end a line
+                i += 1
+                if i < len(buf) and buf[i] in (0, 10) and byte == 13:
+                    i += 1
+                self.buffer = buf[i:]
+                return clean.decode("utf-8", errors="ignore")
+            clean.append(byte)
+            i += 1
+        return None
+
+
+class VrpSimulator:
+    def __init__(self, zones, scale=1.0, latency=None, vty_limit=VTY_LIMIT, username=None, password=None):
+        self.zones = zones
+        self.scale = scale
+        self.latency = dict(COMMAND_LATENCY, **(latency or {}))
+        self.vty_limit = vty_limit
+        self.username = username
+        self.password = password
+        self.sessions = {name: 0 for name in zones}
+        self.commands = 0
+        self.servers = []
+        self.loop = None
+        self.thread = None
+
+    async def _pause(self, seconds):
+        if seconds > 0 and self.scale > 0:
+            await asyncio.sleep(seconds * self.scale)
+
+    def _credentials_ok(self, username, password):
+        return ((self.username is None or username == self.username) and
+                (self.password is None or password == self.password))
+
+    async def _session(self, zone_name, reader, writer):
+        zone = self.zones[zone_name]
+        term = _Terminal(reader, writer)
+
+        if self.sessions[zone_name] >= self.vty_limit:
+            await term.write("Error: The number of VTY users has reached the upper limit.\n")
+            writer.close()
+            return
+        self.sessions[zone_name] += 1
+
+        try:
+            await term.write("Username:")
+            username = await term.readline()
+            await term.write("Password:")
+            password = await term.readline(echo=False)
+            if username is None or password is None or not self._credentials_ok(username.strip(), password):
+                await term.write("\nError: Authentication fail\n")
+                return
+
+            stack = [zone["bastion"]]
+            await term.write(f"\nInfo: The max number of VTY users is {self.vty_limit}.\n{stack[-1].prompt}")
+
+            while True:
+                line = await term.readline()
+                if line is None:
+                    return
+                command = line.strip()
+                device = stack[-1]
+
+                if not command or command == "\x03":
+                    await term.write(f"\n{device.prompt}")
+                elif command.startswith("stelnet "):
+                    remote = await self._stelnet(term, zone, command.split()[1])
+                    if remote:
+                        stack.append(remote)
+                    await term.write(stack[-1].prompt)
+                elif "quit".startswith(command) and len(command) >= 2:
+                    if len(stack) == 1:
+                        return
+                    stack.pop()
+                    await term.write(f"\n{stack[-1].prompt}")
+                else:
+                    factor = CORE_FACTOR if device.role == "core" else 1.0
+                    await self._pause(self.latency.get(command, DEFAULT_LATENCY) * factor)
+                    self.commands += 1
+                    await term.write(device.answer(command) + device.prompt)
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            # Client gone, or the simulator is shutting down
+            pass
+        finally:
+            self.sessions[zone_name] -= 1
+            writer.close()
+
+    async def _stelnet(self, term, zone, ip):
+        """The VRP stelnet client dialog; returns the target device or None"""
+        await term.write(f"Trying {ip} ...\nPress CTRL + K to abort\n")
+        await self._pause(LOGIN_STEP_LATENCY)
+        device = zone["devices"].get(ip)
+        if device is None:
+            await term.write("Error: Failed to connect to the remote host.\n")
+            return None
+
+        await term.write(f"Connected to {ip} ...\nThe server is not authenticated. Continue to access it? [Y/N]:")
+        # Prompt shown after each answer: Y to the warning, N to the key, then the username
+        steps = ["Save the server's public key? [Y/N]:", "\nPlease input the username:", "Enter password:"]
+        answers = []
+        for prompt in steps:
+            answer = await term.readline()
+            if answer is None or answer == "\x03":
+                return None
+            answers.append(answer.strip())
+            await self._pause(LOGIN_STEP_LATENCY)
+            await term.write(prompt)
+
+        password = await term.readline(echo=False)
+        if password is None or password == "\x03":
+            return None
+        await self._pause(LOGIN_STEP_LATENCY)
+        if not self._credentials_ok(answers[2], password):
+            await term.write("\nError: Authentication fail\n")
+            return None
+
+        await term.write(f"\nInfo: The max number of VTY users is {self.vty_limit}.\n")
+        return device
+
+    async def _start(self, host, base_port):
+        ports = {}
+        for i, zone_name in enumerate(self.zones):
+            port = base_port + i
+            server = await asyncio.start_server(
+                lambda r, w, z=zone_name: self._session(z, r, w), host, port)
+            self.servers.append(server)
+            ports[zone_name] = port
+        return ports
+
+    def run(self, host="127.0.0.1", base_port=DEFAULT_BASE_PORT):
+        """Serve in the foreground until Ctrl+C"""
+        async def main():
+            ports = await self._start(host, base_port)
+            for zone_name, port in ports.items():
+                print(f"[*] {zone_name}: {host}:{port}, {len(self.zones[zone_name]['devices'])} devices")
+            await asyncio.gather(*(server.serve_forever() for server in self.servers))
+
+        try:
+            asyncio.run(main())
+        except KeyboardInterrupt:
+            pass
+
+    def start_background(self, host="127.0.0.1", base_port=DEFAULT_BASE_PORT):
+        """Serve from a daemon thread (benchmarks); returns {zone: port}"""
+        self.loop = asyncio.new_event_loop()
+        ready = threading.Event()
+        result = {}
+
+        def target():
+            asyncio.set_event_loop(self.loop)
+            result.update(self.loop.run_until_complete(self._start(host, base_port)))
+            ready.set()
+            self.loop.run_forever()
+
+        self.thread = threading.Thread(target=target, daemon=True)
+        self.thread.start()
+        ready.wait()
+        return result
+
+    def stop(self):
+        if not self.loop:
+            return
+
+        async def shutdown():
+            for server in self.servers:
+                server.close()
+            sessions = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+            for task in sessions:
+                task.cancel()
+            await asyncio.gather(*sessions, return_exceptions=True)
+
+        asyncio.run_coroutine_threadsafe(shutdown(), self.loop).result(5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(5)
+
+
+def write_inventory(path, zones, ports, host="127.0.0.1", sessions=4):
+    """Collector inventory pointing every zone at its simulated bastion"""
+    data = {
+        "defaults": {"device_type": "huawei_telnet", "username": "pccw2023", "sessions": sessions},
+        "zones": {
+            name: {
+                "bastion": host,
+                "port": ports[name],
+                "targets": [{"name": d.hostname, "host": ip, "role": d.role} for ip, d in zone["devices"].items()],
+            }
+            for name, zone in zones.items()
+        },
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=1)
+
+
+def _parse_latency(values):
+    latency = {}
+    for value in values or []:
+        command, _, seconds = value.rpartition("=")
+        latency[command] = float(seconds)
+    return latency
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Simulated Huawei VRP bastions and switches")
+    parser.add_argument("-i", "--inventory", default=None, help="Serve the targets of this collector inventory")
+    parser.add_argument("--synthetic", type=int, default=0, help="Also serve N synthetic devices in zone SIM")
+    parser.add_argument("-r", "--recording", action="append", help="Session logs to replay (repeatable)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--base-port", type=int, default=DEFAULT_BASE_PORT, help="First zone's port")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every latency (0 = none)")
+    parser.add_argument("--latency", action="append", metavar="COMMAND=SECONDS", help="Per-command latency")
+    parser.add_argument("--vty-limit", type=int, default=VTY_LIMIT, help="Concurrent sessions per bastion")
+    parser.add_argument("--write-inventory", default=None, help="Write a collector inventory for the simulator")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    recordings = load_recordings(args.recording or DEFAULT_RECORDINGS)
+    if not recordings:
+        print("[Error] No recorded device output to replay.")
+        sys.exit(1)
+    if not args.inventory and not args.synthetic:
+        args.synthetic = 10
+
+    zones = build_zones(recordings, args.inventory, args.synthetic)
+    sim = VrpSimulator(zones, args.scale, _parse_latency(args.latency), args.vty_limit)
+
+    if args.write_inventory:
+        ports = {name: args.base_port + i for i, name in enumerate(zones)}
+        write_inventory(args.write_inventory, zones, ports, args.host)
+        print(f"[*] Inventory for the simulator -> {args.write_inventory}")
+
+    print(f"[*] Replaying {len(recordings)} recorded devices as "
+          f"{sum(len(z['devices']) for z in zones.values())} simulated switches")
+    start = time.time()
+    sim.run(args.host, args.base_port)
+    print(f"[*] Served {sim.commands} commands in {time.time() - start:.0f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+import os
+import io
+import sys
+import json
+import argparse
+import contextlib
+from array import array
+
+from interface_names import canonical_name
+
+# ==============================================================================
+# VLAN SETS AND VLAN -> PORT INDEX
+#
+#   python vlan_index.py build vlan_index.json configs/          (or globs/files)
+#   python vlan_index.py query vlan_index.json 312
+# ==============================================================================
+
+VLAN_MIN = 1
+VLAN_MAX = 4094
+
+
+class VlanSet:
+    """
+    Set of VLAN IDs stored as a 4095-bit integer bitmap.
+    Parses VRP syntax ("10 to 200 300 400 to 4094", "all", "10") and prints
+    back in the same syntax.
+    """
+    __slots__ = ("bits",)
+
+    def __init__(self, bits=0):
+        self.bits = bits
+
+    @classmethod
+    def parse(cls, text):
+        bits = 0
+        if not text:
+            return cls(bits)
+
+        tokens = str(text).replace(",", " ").split()
+        i = 0
+        while i < len(tokens):
+            token = tokens[i]
+            if token.lower() == "all":
+                bits |= ((1 << (VLAN_MAX + 1)) - 1) & ~1
+                i += 1
+                continue
+            if not token.isdigit():
+                # "Vlan 10" style labels from the audit report, or noise
+                i += 1
+                continue
+
+            start = end = int(token)
+            if i + 2 < len(tokens) and tokens[i + 1] == "to" and tokens[i + 2].isdigit():
+                end = int(tokens[i + 2])
+                i += 3
+            else:
+                i += 1
+
+            start, end = max(min(start, end), VLAN_MIN), min(max(start, end), VLAN_MAX)
+            if start <= end:
+                bits |= ((1 << (end - start + 1)) - 1) << start
+        return cls(bits)
+
+    @classmethod
+    def from_intervals(cls, intervals):
+        bits = 0
+        for start, end in intervals:
+            bits |= ((1 << (end - start + 1)) - 1) << start
+        return cls(bits)
+
+    def __contains__(self, vlan_id):
+        return vlan_id >= 0 and (self.bits >> vlan_id) & 1 == 1
+
+    def __len__(self):
+        return bin(self.bits).count("1")
+
+    def __bool__(self):
+        return self.bits != 0
+
+    def __iter__(self):
+        bits = self.bits
+        vlan_id = 0
+        while bits:
+            if bits & 1:
+                yield vlan_id
+            bits >>= 1
+            vlan_id += 1
+
+    def __or__(self, other):
+        return VlanSet(self.bits | other.bits)
+
+    def __and__(self, other):
+        return VlanSet(self.bits & other.bits)
+
+    def __eq__(self, other):
+        return isinstance(other, VlanSet) and self.bits == other.bits
+
+    def __hash__(self):
+        return hash(self.bits)
+
+    def intervals(self):
+        """[(start, end), ...] runs of consecutive VLAN IDs."""
+        runs = []
+        bits = self.bits
+        offset = 0
+        while bits:
+            # skip zeros, then measure the run of ones
+            zeros = (bits & -bits).bit_length() - 1
+            bits >>= zeros
+            offset += zeros
+            ones = (~bits & (bits + 1)).bit_length() - 1
+            runs.append((offset, offset + ones - 1))
+            bits >>= ones
+            offset += ones
+        return runs
+
+    def to_vrp(self):
+        return " ".join(str(s) if s == e else f"{s} to {e}" for s, e in self.intervals())
+
+    def __str__(self):
+        return self.to_vrp()
+
+    def __repr__(self):
+        return f"VlanSet({self.to_vrp()!r})"
+
+
+def parse_vlan_spec(text):
+    return VlanSet.parse(text)
+
+
+class VlanIndex:
+    """
+    Inverted index VLAN ID -> interfaces, across any number of devices.
+    ports_for_vlan() is a single list lookup; the index is persisted as
+    per-interface VLAN intervals and re-expanded on load (no config reparse).
+    """
+
+    def __init__(self):
+        self.ports = []          # [(device, interface)]
+        self.vlan_sets = []      # VlanSet per port, same order
+        self._port_ids = {}
+        self._by_vlan = [array("I") for _ in range(VLAN_MAX + 1)]
+
+    def __len__(self):
+        return sum(1 for vlans in self.vlan_sets if vlans)
+
+    def add(self, device, interface, vlans):
+        """
+        Index one port. A port added again (e.g. from a re-collected capture)
+        keeps one entry, with the VLANs of the latest add.
+        """
+        if not isinstance(vlans, VlanSet):
+            vlans = VlanSet.parse(vlans)
+        by_vlan = self._by_vlan
+        # Ports keep the device's spelling; lookups match any spelling of the name
+        key = (device, canonical_name(interface))
+        port_id = self._port_ids.get(key)
+        if port_id is not None:
+            old = self.vlan_sets[port_id]
+            if old == vlans:
+                return
+            for vlan_id in old:
+                by_vlan[vlan_id].remove(port_id)
+            self.ports[port_id] = (device, interface)
+            self.vlan_sets[port_id] = vlans
+        elif not vlans:
+            return
+        else:
+            port_id = len(self.ports)
+            self._port_ids[key] = port_id
+            self.ports.append((device, interface))
+            self.vlan_sets.append(vlans)
+        for start, end in vlans.intervals():
+            for vlan_id in range(start, end + 1):
+                by_vlan[vlan_id].append(port_id)
+
+    def add_device(self, hostname, interfaces):
+        """
+        Add one device parsed by config_to_excel.parse_vrp_config.
+        Eth-Trunk members ("See Trunk") inherit the VLANs of their Eth-Trunk.
+        """
+        for name, iface in interfaces.items():
+            vlan = iface["vlan"]
+            if iface["is_trunk_member"]:
+                trunk = interfaces.get(f"Eth-Trunk{iface['trunk_id']}")
+                vlan = trunk["vlan"] if trunk else ""
+            self.add(hostname, name, vlan)
+
+    def ports_for_vlan(self, vlan_id):
+        if not VLAN_MIN <= vlan_id <= VLAN_MAX:
+            return []
+        ports = self.ports
+        return [ports[i] for i in self._by_vlan[vlan_id]]
+
+    def vlans_for_port(self, device, interface):
+        port_id = self._port_ids.get((device, canonical_name(interface)))
+        return self.vlan_sets[port_id] if port_id is not None else VlanSet()
+
+    def save(self, path):
+        data = {
+            "ports": [
+                [device, interface, vlans.intervals()]
+                for (device, interface), vlans in zip(self.ports, self.vlan_sets) if vlans
+            ]
+        }
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        index = cls()
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        for device, interface, intervals in data["ports"]:
+            index.add(device, interface, VlanSet.from_intervals(intervals))
+        return index
+
+
+def build_index(inputs):
+    # config_to_excel pulls in openpyxl; only needed when building from configs
+    from config_to_excel import collect_config_files, device_label, parse_vrp_config
+
+    index = VlanIndex()
+    for path in collect_config_files(inputs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            meta, interfaces = parse_vrp_config(path)
+        index.add_device(device_label(meta, path), interfaces)
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="VLAN-to-port index for Huawei VRP configs")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_build = sub.add_parser("build", help="Parse configs and write the index")
+    p_build.add_argument("index")
+    p_build.add_argument("inputs", nargs="+", help="Config files, directories or glob patterns")
+
+    p_query = sub.add_parser("query", help="List ports carrying a VLAN")
+    p_query.add_argument("index")
+    p_query.add_argument("vlan", type=int)
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        index = build_index(args.inputs)
+        index.save(args.index)
+        print(f"[*] Indexed {len(index)} VLAN-carrying ports -> {args.index}")
+        return
+
+    index = VlanIndex.load(args.index)
+    ports = index.ports_for_vlan(args.vlan)
+    for device, interface in ports:
+        print(f"{device}\t{interface}")
+    print(f"[*] VLAN {args.vlan}: {len(ports)} ports", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
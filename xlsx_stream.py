@@ -0,0 +1,78 @@
+# ==============================================================================
+# STREAMING XLSX WRITER
+#
+# Thin wrapper over xlsxwriter's constant_memory mode: rows are flushed to disk
+# as they are appended, and column widths are tracked per row so no second
+# pass over the cells is needed. Peak memory stays flat with row count.
+# ==============================================================================
+
+WIDTH_PADDING = 2
+WIDTH_SCALE = 1.2
+MAX_WIDTH = 100
+
+
+class StreamingSheet:
+    def __init__(self, worksheet, header=None):
+        self.worksheet = worksheet
+        self.widths = []
+        self.rows = 0
+        if header:
+            self.append(header)
+
+    def append(self, values):
+        widths = self.widths
+        for col, value in enumerate(values):
+            if value is None or value != value:   # None / NaN -> empty cell
+                text_len = 0
+            else:
+                text_len = len(str(value))
+                self.worksheet.write(self.rows, col, value)
+            if col < len(widths):
+                if text_len > widths[col]:
+                    widths[col] = text_len
+            else:
+                widths.append(text_len)
+        self.rows += 1
+
+    def extend(self, rows):
+        for values in rows:
+            self.append(values)
+
+    def finish(self):
+        # Same fit rule the openpyxl reports used: (longest value + 2) * 1.2
+        for col, max_length in enumerate(self.widths):
+            width = min((max_length + WIDTH_PADDING) * WIDTH_SCALE, MAX_WIDTH)
+            self.worksheet.set_column(col, col, width)
+
+
+class StreamingWorkbook:
+    """
+    with StreamingWorkbook("out.xlsx") as wb:
+        sheet = wb.add_sheet("Interfaces", ["Hostname", "Interface", ...])
+        for row in rows:
+            sheet.append(row)
+    """
+
+    def __init__(self, path):
+        # Optional dependency, only needed for streaming output
+        import xlsxwriter
+
+        self.path = path
+        self.workbook = xlsxwriter.Workbook(path, {"constant_memory": True, "strings_to_numbers": False})
+        self.sheets = []
+
+    def add_sheet(self, name, header=None):
+        sheet = StreamingSheet(self.workbook.add_worksheet(name[:31]), header)
+        self.sheets.append(sheet)
+        return sheet
+
+    def close(self):
+        for sheet in self.sheets:
+            sheet.finish()
+        self.workbook.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()